@@ -0,0 +1,184 @@
+"""
+CogniScan - Test Battery Registry
+
+Each test in the assessment is a plugin module in this package. A plugin
+module defines a TestController holding the test's session state, test
+data and answer handlers, its TestScreen classes laid out in a kv file of
+the same name, and a TestPlugin tying them together with the test's title
+and maximum points.
+
+The registry maps test names to module paths only, so nothing is imported
+until a test is about to run: get_plugin() imports a test's module and
+load_screens() builds its kv layout and adds its screens to the screen
+manager. Additional tests are made available with register().
+"""
+
+import importlib
+import os
+
+from kivy.event import EventDispatcher
+from kivy.lang import Builder
+from kivy.properties import ObjectProperty
+from kivy.uix.screenmanager import Screen
+
+
+class TestController(EventDispatcher):
+    """
+    Session state and handlers of one test.
+
+    The app creates one controller per test when the test is first needed
+    and keeps it for the life of the app; reset() clears it for each new
+    session. generate_stimuli() draws the session's test data, which
+    stimuli returns and restore_stimuli() loads back, e.g. from an event
+    log. Answer and timer handlers are decorated with eventlog.logged and
+    logged as "<test name>.<method>".
+
+    score_fields names the attributes holding raw scores, reported with the
+    session's final scores and compared on replay. session_buffers names
+    list properties emptied in place when the assessment restarts.
+    """
+
+    score_fields = ()
+    session_buffers = ()
+
+    def __init__(self, app, name, **kwargs):
+        super().__init__(**kwargs)
+        self.app = app
+        self.name = name
+        self.reset()
+
+    @property
+    def event_log(self):
+        return self.app.event_log
+
+    @property
+    def event_prefix(self):
+        return self.name + '.'
+
+    def screen(self, name):
+        return self.app.root.get_screen(name)
+
+    def reset(self):
+        """Clear per-session state."""
+
+    def generate_stimuli(self):
+        """Draw this session's test data."""
+
+    @property
+    def stimuli(self):
+        """This session's test data as a plain dictionary."""
+        return {}
+
+    def restore_stimuli(self, stimuli):
+        """Load test data produced by stimuli."""
+
+    def prepare(self):
+        """Called just before the test starts."""
+
+    def score(self):
+        """Raw points earned, at most the plugin's max_points."""
+        raise NotImplementedError
+
+    def raw_scores(self):
+        return {name: int(getattr(self, name)) for name in self.score_fields}
+
+
+class TestScreen(Screen):
+    """Screen of a test; its controller is available in kv as root.test."""
+    test = ObjectProperty(None)
+
+
+class TestPlugin:
+    """
+    Declaration of one test in the battery.
+
+    screens lists (screen name, TestScreen class) pairs in the order the test
+    visits them; the first is the test's entry point. controller is the
+    test's TestController class. timed_screens names the screens that run
+    against a timer and need the full frame rate while shown.
+    """
+
+    def __init__(self, name, title, max_points, screens, controller, timed_screens=()):
+        self.name = name
+        self.title = title
+        self.max_points = max_points
+        self.screens = screens
+        self.controller = controller
+        self.timed_screens = tuple(timed_screens)
+        self.kv_file = None
+
+    @property
+    def first_screen(self):
+        return self.screens[0][0]
+
+
+# Test name -> plugin module path, in default battery order
+AVAILABLE_TESTS = {
+    'orientation': 'battery.orientation',
+    'immediate_recall': 'battery.immediate_recall',
+    'serial7s': 'battery.serial7s',
+    'digit_span': 'battery.digit_span',
+    'category_fluency': 'battery.category_fluency',
+    'stroop': 'battery.stroop',
+    'delayed_recall': 'battery.delayed_recall',
+}
+
+DEFAULT_BATTERY = tuple(AVAILABLE_TESTS)
+
+# Test name -> tests that must run earlier in the same battery. Kept here
+# rather than on TestPlugin so a battery can be checked without importing it.
+REQUIRED_EARLIER = {
+    'delayed_recall': ('immediate_recall',),
+}
+
+_plugins = {}
+
+
+def register(name, module_path, requires=()):
+    """Make a test plugin module available under name."""
+    AVAILABLE_TESTS[name] = module_path
+    if requires:
+        REQUIRED_EARLIER[name] = tuple(requires)
+
+
+def parse_battery(text):
+    """
+    Parse a comma-separated list of test names. Rejects an empty battery,
+    unknown or repeated tests, and tests placed before (or without) the
+    tests they require.
+    """
+    names = [name.strip() for name in text.split(',') if name.strip()]
+    if not names:
+        raise ValueError("The battery must include at least one test")
+    unknown = [name for name in names if name not in AVAILABLE_TESTS]
+    if unknown:
+        raise ValueError(f"Unknown test(s) in battery: {', '.join(unknown)}")
+    repeated = sorted({name for name in names if names.count(name) > 1})
+    if repeated:
+        raise ValueError(f"Test(s) repeated in battery: {', '.join(repeated)}")
+    for index, name in enumerate(names):
+        missing = [required for required in REQUIRED_EARLIER.get(name, ())
+                   if required not in names[:index]]
+        if missing:
+            raise ValueError(f"{name} must come after {', '.join(missing)} in the battery")
+    return names
+
+
+def get_plugin(name):
+    """Import a test's module if needed and return its TestPlugin."""
+    if name not in _plugins:
+        module = importlib.import_module(AVAILABLE_TESTS[name])
+        plugin = module.PLUGIN
+        plugin.kv_file = os.path.splitext(module.__file__)[0] + '.kv'
+        _plugins[name] = plugin
+    return _plugins[name]
+
+
+def load_screens(plugin, manager, controller):
+    """Load a test's kv layout and add its screens to the screen manager once."""
+    if manager.has_screen(plugin.first_screen):
+        return
+    if plugin.kv_file not in Builder.files:
+        Builder.load_file(plugin.kv_file)
+    for _, screen_class in plugin.screens:
+        manager.add_widget(screen_class(test=controller))
@@ -0,0 +1,117 @@
+"""Category fluency test: name as many animals as possible in 60 seconds."""
+
+from kivy.properties import StringProperty, ListProperty
+
+from battery import TestController, TestPlugin, TestScreen
+from eventlog import logged
+
+
+class CategoryFluencyIntroScreen(TestScreen):
+    """Introduction to category fluency test."""
+    pass
+
+
+class CategoryFluencyScreen(TestScreen):
+    """Category fluency test - name animals."""
+    timer = StringProperty("60")
+    pass
+
+
+class CategoryFluencyScoreScreen(TestScreen):
+    """Display category fluency score."""
+    fluency_score = StringProperty("0/3")
+    animals_count = StringProperty("0")
+    pass
+
+
+class CategoryFluencyTest(TestController):
+    """Distinct animals named within the time limit, scored against norms."""
+
+    score_fields = ('fluency_score',)
+    session_buffers = ('animals_entered',)
+
+    animals_entered = ListProperty([])
+
+    # Display properties
+    recent_animals_text = StringProperty("None yet")
+    animals_count_text = StringProperty("0")
+
+    def reset(self):
+        self.fluency_score = 0
+        self.recent_animals_text = "None yet"
+        self.animals_count_text = "0"
+
+    def start_timer(self, duration=60):
+        """Start the 60-second fluency timer."""
+        screen = self.screen('categoryfluency')
+        screen.timer = str(duration)
+
+        def update_timer(dt):
+            current = int(screen.timer)
+            if current > 0:
+                screen.timer = str(current - 1)
+            else:
+                self.on_timeout()
+
+        self.app.lifecycle.schedule_interval('fluency', update_timer, 1)
+
+    @logged
+    def on_timeout(self):
+        """End the fluency test when time is up."""
+        self.cancel_timer()
+        self.finish()
+        self.app.root.current = 'fluencyscore'
+
+    def cancel_timer(self):
+        """Cancel fluency timer."""
+        self.app.lifecycle.cancel('fluency')
+
+    @logged
+    def add_animal(self, animal):
+        """Add an animal to the list."""
+        animal = animal.strip().lower()
+        if animal and animal not in self.animals_entered and len(animal) > 1:
+            self.animals_entered.append(animal)
+            # Update display properties
+            self.animals_count_text = str(len(self.animals_entered))
+            self.recent_animals_text = ", ".join(self.animals_entered[-5:])
+
+    @logged
+    def finish(self):
+        """Calculate and display fluency score."""
+        count = len(self.animals_entered)
+
+        # Scoring based on normative data:
+        # 15+ animals = 3 points
+        # 10-14 animals = 2 points
+        # 5-9 animals = 1 point
+        # <5 animals = 0 points
+        if count >= 15:
+            self.fluency_score = 3
+        elif count >= 10:
+            self.fluency_score = 2
+        elif count >= 5:
+            self.fluency_score = 1
+        else:
+            self.fluency_score = 0
+
+        screen = self.screen('fluencyscore')
+        screen.fluency_score = f"{self.fluency_score}/3"
+        screen.animals_count = str(count)
+
+    def score(self):
+        return self.fluency_score
+
+
+PLUGIN = TestPlugin(
+    name='category_fluency',
+    title="Category Fluency",
+    max_points=3,
+    screens=[
+        ('categoryfluencyintro', CategoryFluencyIntroScreen),
+        ('categoryfluency', CategoryFluencyScreen),
+        ('fluencyscore', CategoryFluencyScoreScreen),
+    ],
+    controller=CategoryFluencyTest,
+    timed_screens=('categoryfluency',),
+)
@@ -0,0 +1,73 @@
+"""Delayed recall test: recall the 5 words memorized earlier."""
+
+from kivy.properties import StringProperty, ListProperty
+
+from battery import TestController, TestPlugin, TestScreen
+from eventlog import logged
+
+
+class DelayedRecallIntroScreen(TestScreen):
+    """Introduction to delayed recall test."""
+    pass
+
+
+class DelayedRecallScreen(TestScreen):
+    """User tries to recall the 5 words from earlier."""
+    pass
+
+
+class DelayedRecallScoreScreen(TestScreen):
+    """Display delayed recall score."""
+    delayed_score = StringProperty("0/5")
+    pass
+
+
+class DelayedRecallTest(TestController):
+    """Recall of the words memorized in the immediate recall test."""
+
+    score_fields = ('delayed_recall_score',)
+    session_buffers = ('checked_words',)
+
+    checked_words = ListProperty([])
+
+    def reset(self):
+        self.delayed_recall_score = 0
+
+    @property
+    def words(self):
+        # The battery always runs immediate_recall first (see REQUIRED_EARLIER)
+        return self.app.test('immediate_recall').words
+
+    @logged
+    def calculate_recall(self, input_words):
+        """Calculate score for delayed word recall."""
+        words_list = input_words.lower().replace(',', ' ').split()
+
+        for word in words_list:
+            word = word.strip()
+            if word in [w.lower() for w in self.words] and word not in self.checked_words:
+                self.delayed_recall_score += 1
+                self.checked_words.append(word)
+
+        return f"{self.delayed_recall_score}/5"
+
+    def finish(self):
+        """Display delayed recall score."""
+        screen = self.screen('delayedrecallscore')
+        screen.delayed_score = f"{self.delayed_recall_score}/5"
+
+    def score(self):
+        return self.delayed_recall_score
+
+
+PLUGIN = TestPlugin(
+    name='delayed_recall',
+    title="Delayed Recall",
+    max_points=5,
+    screens=[
+        ('delayedrecallintro', DelayedRecallIntroScreen),
+        ('delayedrecall', DelayedRecallScreen),
+        ('delayedrecallscore', DelayedRecallScoreScreen),
+    ],
+    controller=DelayedRecallTest,
+)
@@ -0,0 +1,147 @@
+"""Digit span test: repeat digit sequences forward and backward."""
+
+import random
+
+from kivy.properties import StringProperty, ListProperty
+
+from battery import TestController, TestPlugin, TestScreen
+from eventlog import logged
+
+
+class DigitSpanIntroScreen(TestScreen):
+    """Introduction to digit span test."""
+    pass
+
+
+class DigitSpanForwardScreen(TestScreen):
+    """Forward digit span test."""
+    digits_to_remember = StringProperty("")
+    pass
+
+
+class DigitSpanBackwardScreen(TestScreen):
+    """Backward digit span test."""
+    digits_to_remember = StringProperty("")
+    pass
+
+
+class DigitSpanScoreScreen(TestScreen):
+    """Display digit span score."""
+    digit_span_score = StringProperty("0/4")
+    pass
+
+
+class DigitSpanTest(TestController):
+    """
+    Digit sequences repeated forward from 3 digits and backward from 2,
+    growing by one digit after each correct answer.
+    """
+
+    score_fields = ('digit_span_forward_score', 'digit_span_backward_score')
+
+    forward_digits = ListProperty([])
+    backward_digits = ListProperty([])
+
+    def reset(self):
+        self.digit_span_forward_score = 0
+        self.digit_span_backward_score = 0
+        self.forward_level = 3
+        self.backward_level = 2
+
+    def generate_stimuli(self):
+        """Generate digit sequences for digit span test."""
+        # Forward digits - start with 3 digits
+        self.forward_digits[:] = [random.randint(1, 9) for _ in range(5)]
+        # Backward digits - start with 2 digits
+        self.backward_digits[:] = [random.randint(1, 9) for _ in range(4)]
+
+    @property
+    def stimuli(self):
+        return {
+            'forward_digits': list(self.forward_digits),
+            'backward_digits': list(self.backward_digits),
+        }
+
+    def restore_stimuli(self, stimuli):
+        self.forward_digits[:] = stimuli['forward_digits']
+        self.backward_digits[:] = stimuli['backward_digits']
+
+    def prepare(self):
+        """Show the first forward sequence."""
+        self.screen('digitspanforward').digits_to_remember = self.get_forward_digits(self.forward_level)
+
+    def get_forward_digits(self, level):
+        """Get forward digit sequence for given level."""
+        return ' - '.join(str(d) for d in self.forward_digits[:level])
+
+    def get_backward_digits(self, level):
+        """Get backward digit sequence for given level."""
+        return ' - '.join(str(d) for d in self.backward_digits[:level])
+
+    def check_forward_digits(self, user_input, level):
+        """Check forward digit recall."""
+        user_digits = [d.strip() for d in user_input.replace('-', ' ').replace(',', ' ').split() if d.strip().isdigit()]
+        correct_digits = [str(d) for d in self.forward_digits[:level]]
+
+        if user_digits == correct_digits:
+            self.digit_span_forward_score += 1
+            return True
+        return False
+
+    def check_backward_digits(self, user_input, level):
+        """Check backward digit recall."""
+        user_digits = [d.strip() for d in user_input.replace('-', ' ').replace(',', ' ').split() if d.strip().isdigit()]
+        correct_digits = [str(d) for d in reversed(self.backward_digits[:level])]
+
+        if user_digits == correct_digits:
+            self.digit_span_backward_score += 1
+            return True
+        return False
+
+    @logged
+    def handle_forward_submit(self, user_input):
+        """Handle forward digit span submission."""
+        passed = self.check_forward_digits(user_input, self.forward_level)
+
+        if passed and self.forward_level < 4:
+            self.forward_level += 1
+            self.screen('digitspanforward').digits_to_remember = self.get_forward_digits(self.forward_level)
+        else:
+            backward_screen = self.screen('digitspanbackward')
+            backward_screen.digits_to_remember = self.get_backward_digits(self.backward_level)
+            self.app.root.current = "digitspanbackward"
+
+    @logged
+    def handle_backward_submit(self, user_input):
+        """Handle backward digit span submission."""
+        passed = self.check_backward_digits(user_input, self.backward_level)
+
+        if passed and self.backward_level < 3:
+            self.backward_level += 1
+            self.screen('digitspanbackward').digits_to_remember = self.get_backward_digits(self.backward_level)
+        else:
+            self.finish()
+            self.app.root.current = "digitspanscore"
+
+    def finish(self):
+        """Calculate and display digit span score."""
+        screen = self.screen('digitspanscore')
+        screen.digit_span_score = f"{self.score()}/4"
+
+    def score(self):
+        # Max 2 points for forward (levels 3,4), 2 points for backward (levels 2,3)
+        return min(self.digit_span_forward_score + self.digit_span_backward_score, 4)
+
+
+PLUGIN = TestPlugin(
+    name='digit_span',
+    title="Digit Span",
+    max_points=4,
+    screens=[
+        ('digitspanintro', DigitSpanIntroScreen),
+        ('digitspanforward', DigitSpanForwardScreen),
+        ('digitspanbackward', DigitSpanBackwardScreen),
+        ('digitspanscore', DigitSpanScoreScreen),
+    ],
+    controller=DigitSpanTest,
+)
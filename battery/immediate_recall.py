@@ -0,0 +1,178 @@
+"""Immediate recall test: memorize 5 words and recall them straight away."""
+
+import os
+import random
+
+from kivy.properties import StringProperty, ListProperty
+
+from battery import TestController, TestPlugin, TestScreen
+from eventlog import logged
+from word_similarity import WordSimilarity, read_word_bank
+
+
+WORDS_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "words.txt")
+
+
+class FiveWordsIntroScreen(TestScreen):
+    """Introduction to immediate word recall test."""
+    pass
+
+
+class FiveWordsScreen(TestScreen):
+    """Display 5 words for memorization."""
+    countdown = StringProperty("10")
+    pass
+
+
+class ImmediateRecallScreen(TestScreen):
+    """User enters words they remember immediately."""
+    pass
+
+
+class ImmediateRecallScoreScreen(TestScreen):
+    """Display immediate recall score."""
+    immediate_score = StringProperty("0/5")
+    pass
+
+
+class ImmediateRecallTest(TestController):
+    """
+    Five mutually dissimilar words shown for a fixed time, then recalled.
+    The words are recalled again by the delayed recall test.
+    """
+
+    score_fields = ('immediate_recall_score',)
+    session_buffers = ('checked_words',)
+
+    words = ListProperty([])
+    checked_words = ListProperty([])
+
+    def __init__(self, app, name, **kwargs):
+        super().__init__(app, name, **kwargs)
+        self.load_word_similarity()
+
+    def reset(self):
+        self.immediate_recall_score = 0
+
+    # ========================================================================
+    # WORD GENERATION
+    # ========================================================================
+
+    def load_word_similarity(self):
+        """Load the word bank's similarity matrix, cached in the user data directory."""
+        try:
+            self.word_similarity = WordSimilarity.load(
+                WORDS_PATH, os.path.join(self.app.user_data_dir, "words.simcache")
+            )
+        except (FileNotFoundError, ValueError):
+            self.word_similarity = None
+            return
+
+        # Good memorization words: 4-8 letters, alphabetic
+        self.memorable_words_mask = self.word_similarity.eligible_mask(
+            lambda w: 4 <= len(w) <= 8 and w.isalpha()
+        )
+
+    def generate_random_words(self):
+        """Generate 5 random, mutually dissimilar words from the word bank."""
+        if self.word_similarity is not None:
+            words = self.word_similarity.sample(5, eligible=self.memorable_words_mask)
+            if words:
+                return words
+
+        try:
+            word_list = read_word_bank(WORDS_PATH)[0]
+
+            # Filter for good memorization words (4-8 letters, concrete nouns preferred)
+            good_words = [w for w in word_list if 4 <= len(w) <= 8 and w.isalpha()]
+
+            if len(good_words) < 5:
+                good_words = word_list
+
+            random.shuffle(good_words)
+            return good_words[:5]
+        except (FileNotFoundError, ValueError):
+            # Fallback words if file not found
+            return ["apple", "table", "penny", "garden", "finger"]
+
+    def generate_stimuli(self):
+        self.words[:] = self.generate_random_words()
+
+    @property
+    def stimuli(self):
+        return {'words': list(self.words)}
+
+    def restore_stimuli(self, stimuli):
+        self.words[:] = stimuli['words']
+
+    def prepare(self):
+        """Set up the five words display with the session's words."""
+        screen = self.screen('fivewords')
+        for i, word in enumerate(self.words, 1):
+            word_label = screen.ids.get(f'word{i}')
+            if word_label:
+                word_label.text = word.upper()
+
+    # ========================================================================
+    # WORD DISPLAY AND RECALL
+    # ========================================================================
+
+    def start_display_timer(self, duration=10):
+        """Start countdown timer for word display."""
+        screen = self.screen('fivewords')
+        screen.countdown = str(duration)
+
+        def update_countdown(dt):
+            current = int(screen.countdown)
+            if current > 0:
+                screen.countdown = str(current - 1)
+            else:
+                self.on_display_timeout()
+
+        self.app.lifecycle.schedule_interval('word_display', update_countdown, 1)
+
+    @logged
+    def on_display_timeout(self):
+        """Auto-advance to the recall screen when the display time is up."""
+        self.cancel_display_timer()
+        self.app.root.current = 'immediaterecall'
+
+    def cancel_display_timer(self):
+        """Cancel the word display timer if active."""
+        self.app.lifecycle.cancel('word_display')
+
+    @logged
+    def calculate_recall(self, input_words):
+        """Calculate score for immediate word recall."""
+        words_list = input_words.lower().replace(',', ' ').split()
+
+        for word in words_list:
+            word = word.strip()
+            if word in [w.lower() for w in self.words] and word not in self.checked_words:
+                self.immediate_recall_score += 1
+                self.checked_words.append(word)
+
+        return f"{self.immediate_recall_score}/5"
+
+    def finish(self):
+        """Display immediate recall score."""
+        screen = self.screen('immediaterecallscore')
+        screen.immediate_score = f"{self.immediate_recall_score}/5"
+
+    def score(self):
+        return self.immediate_recall_score
+
+
+PLUGIN = TestPlugin(
+    name='immediate_recall',
+    title="Immediate Recall",
+    max_points=5,
+    screens=[
+        ('fivewordsintro', FiveWordsIntroScreen),
+        ('fivewords', FiveWordsScreen),
+        ('immediaterecall', ImmediateRecallScreen),
+        ('immediaterecallscore', ImmediateRecallScoreScreen),
+    ],
+    controller=ImmediateRecallTest,
+    timed_screens=('fivewords',),
+)
@@ -0,0 +1,161 @@
+"""Orientation test: questions about the current date and season."""
+
+from datetime import datetime
+
+from kivy.properties import StringProperty, NumericProperty, ListProperty
+
+from battery import TestController, TestPlugin, TestScreen
+from eventlog import logged
+
+
+class OrientationIntroScreen(TestScreen):
+    """Introduction to orientation questions."""
+    pass
+
+
+class OrientationScreen(TestScreen):
+    """Orientation questions testing awareness of time."""
+    current_question = StringProperty("")
+    question_number = NumericProperty(0)
+    pass
+
+
+class OrientationScoreScreen(TestScreen):
+    """Display orientation test score."""
+    orientation_score = StringProperty("0/5")
+    pass
+
+
+class OrientationTest(TestController):
+    """Five questions about the current date, answered one at a time."""
+
+    score_fields = ('orientation_score',)
+
+    questions = ListProperty([])
+    answers = ListProperty([])
+
+    def reset(self):
+        self.orientation_score = 0
+        self.current_index = 0
+
+    def generate_stimuli(self):
+        """Set up orientation questions based on current date."""
+        now = datetime.now()
+
+        # Season calculation
+        month = now.month
+        if month in [12, 1, 2]:
+            season = "winter"
+        elif month in [3, 4, 5]:
+            season = "spring"
+        elif month in [6, 7, 8]:
+            season = "summer"
+        else:
+            season = "fall"
+
+        # Day of week
+        days = ["monday", "tuesday", "wednesday", "thursday", "friday", "saturday", "sunday"]
+        day_of_week = days[now.weekday()]
+
+        # Month name
+        months = ["january", "february", "march", "april", "may", "june",
+                  "july", "august", "september", "october", "november", "december"]
+        month_name = months[now.month - 1]
+
+        self.questions[:] = [
+            "What year is it?",
+            "What month is it?",
+            "What day of the week is it?",
+            "What is today's date (day number)?",
+            "What season is it?"
+        ]
+
+        self.answers[:] = [
+            str(now.year),
+            month_name,
+            day_of_week,
+            str(now.day),
+            season
+        ]
+
+        self.current_index = 0
+
+    @property
+    def stimuli(self):
+        return {
+            'orientation_questions': list(self.questions),
+            'orientation_answers': list(self.answers),
+        }
+
+    def restore_stimuli(self, stimuli):
+        self.questions[:] = stimuli['orientation_questions']
+        self.answers[:] = stimuli['orientation_answers']
+
+    def prepare(self):
+        """Show the first question."""
+        screen = self.screen('orientation')
+        screen.current_question = self.get_current_question()
+        screen.question_number = 1
+
+    def get_current_question(self):
+        """Get the current orientation question."""
+        if self.current_index < len(self.questions):
+            return self.questions[self.current_index]
+        return ""
+
+    def check_answer(self, user_answer):
+        """Check if the orientation answer is correct."""
+        if self.current_index >= len(self.answers):
+            return False
+
+        correct = self.answers[self.current_index].lower()
+        answer = user_answer.strip().lower()
+
+        # Allow some flexibility in answers
+        is_correct = (answer == correct or
+                      answer in correct or
+                      correct in answer or
+                      (answer.isdigit() and correct.isdigit() and int(answer) == int(correct)))
+
+        if is_correct:
+            self.orientation_score += 1
+
+        self.current_index += 1
+
+        # Update the screen
+        screen = self.screen('orientation')
+        if self.current_index < len(self.questions):
+            screen.current_question = self.questions[self.current_index]
+            screen.question_number = self.current_index + 1
+            return True  # More questions
+        else:
+            return False  # All questions done
+
+    @logged
+    def handle_submit(self, answer):
+        """Handle orientation answer submission."""
+        has_more = self.check_answer(answer)
+        if not has_more:
+            self.finish()
+            self.app.root.current = "orientationscore"
+
+    def finish(self):
+        """Finish orientation test and display score."""
+        screen = self.screen('orientationscore')
+        screen.orientation_score = f"{self.orientation_score}/5"
+
+    def score(self):
+        return self.orientation_score
+
+
+PLUGIN = TestPlugin(
+    name='orientation',
+    title="Orientation",
+    max_points=5,
+    screens=[
+        ('orientationintro', OrientationIntroScreen),
+        ('orientation', OrientationScreen),
+        ('orientationscore', OrientationScoreScreen),
+    ],
+    controller=OrientationTest,
+)
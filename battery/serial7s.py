@@ -0,0 +1,69 @@
+"""Serial 7s test: subtract 7 from 100 five times."""
+
+from kivy.properties import StringProperty, ListProperty
+
+from battery import TestController, TestPlugin, TestScreen
+from eventlog import logged
+
+
+class Serial7sIntroScreen(TestScreen):
+    """Introduction to Serial 7s test."""
+    pass
+
+
+class Serial7sScreen(TestScreen):
+    """Serial 7s subtraction test."""
+    pass
+
+
+class Serial7sScoreScreen(TestScreen):
+    """Display Serial 7s score."""
+    serial7s_score = StringProperty("0/5")
+    pass
+
+
+class Serial7sTest(TestController):
+    """One point for each correct number in the sequence 93, 86, 79, 72, 65."""
+
+    score_fields = ('serial7s_score',)
+    session_buffers = ('checked_numbers',)
+
+    serial7_correct = ["93", "86", "79", "72", "65"]
+    checked_numbers = ListProperty([])
+
+    def reset(self):
+        self.serial7s_score = 0
+
+    @logged
+    def calculate(self, input_nums):
+        """Calculate Serial 7s score."""
+        nums_list = input_nums.replace(',', ' ').split()
+
+        for num in nums_list:
+            num = num.strip()
+            if num in self.serial7_correct and num not in self.checked_numbers:
+                self.serial7s_score += 1
+                self.checked_numbers.append(num)
+
+        return f"{self.serial7s_score}/5"
+
+    def finish(self):
+        """Display Serial 7s score."""
+        screen = self.screen('serial7sscore')
+        screen.serial7s_score = f"{self.serial7s_score}/5"
+
+    def score(self):
+        return self.serial7s_score
+
+
+PLUGIN = TestPlugin(
+    name='serial7s',
+    title="Serial 7s",
+    max_points=5,
+    screens=[
+        ('serial7sintro', Serial7sIntroScreen),
+        ('serial7sscreen', Serial7sScreen),
+        ('serial7sscore', Serial7sScoreScreen),
+    ],
+    controller=Serial7sTest,
+)
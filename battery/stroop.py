@@ -0,0 +1,226 @@
+"""Stroop test: name the ink color of color words."""
+
+import random
+import time
+
+from kivy.properties import StringProperty, NumericProperty, ListProperty
+
+from battery import TestController, TestPlugin, TestScreen
+from calibration import touch_down_time
+from eventlog import logged
+
+
+class StroopTestIntroScreen(TestScreen):
+    """Introduction to Stroop test."""
+    pass
+
+
+class StroopTestScreen(TestScreen):
+    """Stroop color-word test."""
+    word_text = StringProperty("RED")
+    word_color = ListProperty([1, 0, 0, 1])
+    trial_number = NumericProperty(1)
+    timer = StringProperty("30")
+    pass
+
+
+class StroopScoreScreen(TestScreen):
+    """Display Stroop test score."""
+    stroop_score = StringProperty("0/5")
+    pass
+
+
+class StroopTest(TestController):
+    """
+    Ten color words, mostly printed in a different ink color, answered by
+    the ink color. Reaction times are recorded from each word's onset.
+    """
+
+    score_fields = ('stroop_score',)
+    session_buffers = ('reaction_times',)
+
+    trials = ListProperty([])
+    reaction_times = ListProperty([])
+
+    def reset(self):
+        self.stroop_score = 0
+        self.current_trial = 0
+        self.correct = 0
+        self.onset = None
+        self.response = None
+
+    def generate_stimuli(self):
+        """Set up Stroop test trials."""
+        colors = {
+            'red': [1, 0.2, 0.2, 1],
+            'blue': [0.2, 0.4, 1, 1],
+            'green': [0.2, 0.8, 0.2, 1],
+            'yellow': [0.9, 0.9, 0.2, 1]
+        }
+
+        color_names = list(colors.keys())
+
+        # Create 10 trials - mix of congruent and incongruent
+        trials = []
+        for i in range(10):
+            word = random.choice(color_names)
+            # 70% incongruent trials (word doesn't match ink color)
+            if random.random() < 0.7:
+                ink_color = random.choice([c for c in color_names if c != word])
+            else:
+                ink_color = word
+
+            trials.append({
+                'word': word.upper(),
+                'ink_color': ink_color,
+                'color_rgba': colors[ink_color]
+            })
+
+        # Replace contents in place so the same list is reused across sessions
+        self.trials[:] = trials
+        self.current_trial = 0
+        self.correct = 0
+
+    @property
+    def stimuli(self):
+        return {'stroop_trials': [dict(trial) for trial in self.trials]}
+
+    def restore_stimuli(self, stimuli):
+        self.trials[:] = stimuli['stroop_trials']
+
+    def prepare(self):
+        """Show the first trial."""
+        trial = self.get_current_trial()
+        screen = self.screen('strooptest')
+        screen.word_text = trial['word']
+        screen.word_color = trial['color_rgba']
+        screen.trial_number = 1
+
+    def get_current_trial(self):
+        """Get current Stroop trial data."""
+        if self.current_trial < len(self.trials):
+            return self.trials[self.current_trial]
+        return None
+
+    def start_timer(self, duration=30):
+        """Start Stroop test timer once the test screen has been entered."""
+        screen = self.screen('strooptest')
+        screen.timer = str(duration)
+        # The first trial is fully shown once the screen transition has ended
+        self.onset = time.perf_counter()
+
+        def update_timer(dt):
+            current = int(screen.timer)
+            if current > 0:
+                screen.timer = str(current - 1)
+            else:
+                self.on_timeout()
+
+        self.app.lifecycle.schedule_interval('stroop', update_timer, 1)
+
+    @logged
+    def on_timeout(self):
+        """End the Stroop test when time is up."""
+        self.cancel_timer()
+        self.finish()
+        self.app.root.current = 'stroopscore'
+
+    def cancel_timer(self):
+        """Cancel Stroop timer."""
+        self.app.lifecycle.cancel('stroop')
+
+    def button_released(self, button, color):
+        """Handle a tap on a Stroop color button, timed from its touch-down."""
+        if button.last_touch is not None:
+            self.response = touch_down_time(button.last_touch)
+        self.handle_button(color)
+
+    @logged
+    def handle_button(self, color):
+        """Handle Stroop test button press."""
+        has_more = self.check_answer(color)
+        if not has_more:
+            self.finish()
+            self.app.root.current = "stroopscore"
+
+    def check_answer(self, user_answer):
+        """Check Stroop test answer and advance to next trial."""
+        trial = self.get_current_trial()
+        if trial:
+            correct_color = trial['ink_color'].lower()
+            if user_answer.strip().lower() == correct_color:
+                self.correct += 1
+            self.record_reaction_time()
+
+        self.current_trial += 1
+
+        # Update display for next trial
+        screen = self.screen('strooptest')
+        next_trial = self.get_current_trial()
+
+        if next_trial:
+            screen.word_text = next_trial['word']
+            screen.word_color = next_trial['color_rgba']
+            screen.trial_number = self.current_trial + 1
+            self.onset = time.perf_counter()
+            return True  # More trials
+        else:
+            # All trials complete
+            self.cancel_timer()
+            return False
+
+    def record_reaction_time(self):
+        """Record the latency-corrected reaction time of the current trial."""
+        # Responses without a touch (e.g. replayed ones) are timed on handling
+        response = self.response if self.response is not None else time.perf_counter()
+        self.response = None
+        if self.onset is None:
+            return
+        raw = response - self.onset
+        if self.app.latency_profile is not None:
+            raw = self.app.latency_profile.correct(raw)
+        self.reaction_times.append(round(raw * 1000, 1))
+        self.onset = None
+
+    def finish(self):
+        """Calculate and display Stroop score."""
+        # Score based on correct answers out of 10 trials
+        # 9-10 correct = 5 points
+        # 7-8 correct = 4 points
+        # 5-6 correct = 3 points
+        # 3-4 correct = 2 points
+        # 1-2 correct = 1 point
+        # 0 correct = 0 points
+
+        if self.correct >= 9:
+            self.stroop_score = 5
+        elif self.correct >= 7:
+            self.stroop_score = 4
+        elif self.correct >= 5:
+            self.stroop_score = 3
+        elif self.correct >= 3:
+            self.stroop_score = 2
+        elif self.correct >= 1:
+            self.stroop_score = 1
+        else:
+            self.stroop_score = 0
+
+        screen = self.screen('stroopscore')
+        screen.stroop_score = f"{self.stroop_score}/5"
+
+    def score(self):
+        return self.stroop_score
+
+
+PLUGIN = TestPlugin(
+    name='stroop',
+    title="Stroop Test",
+    max_points=5,
+    screens=[
+        ('strooptestintro', StroopTestIntroScreen),
+        ('strooptest', StroopTestScreen),
+        ('stroopscore', StroopScoreScreen),
+    ],
+    controller=StroopTest,
+    timed_screens=('strooptest',),
+)
@@ -0,0 +1,183 @@
+"""
+CogniScan - Device Latency Calibration
+
+Touch-to-event and display latency vary between tablets by tens of
+milliseconds, which confounds reaction times. The calibration routine
+flashes a target a number of times and asks the user to tap it, measuring:
+
+- Dispatch delay (stored as input_latency_ms): time from the input provider
+  creating a touch event to the app's handler receiving it. This is not
+  touch hardware latency, which happens before the event exists
+- Display latency: time from changing the target on screen to the window
+  finishing the next buffer flip
+- Clock jitter: deviation of a 60 Hz Clock interval from its nominal period
+
+The results are stored as a LatencyProfile in the app's user data directory.
+Responses are timed from the moment their touch event was created (see
+touch_down_time), so the dispatch delay is already excluded from them and
+is measured for reference only. Recorded reaction times are corrected by
+subtracting the display latency and the latency before the touch event is
+created (digitizer and driver). The latter is not visible to the app; it
+can be measured externally and entered as extra_input_ms in the stored
+profile.
+"""
+
+import json
+import math
+import time
+from datetime import datetime
+
+from kivy.clock import Clock
+
+
+JITTER_INTERVAL = 1 / 60
+
+
+def touch_down_time(touch):
+    """The time.perf_counter() time at which a touch event was created."""
+    # MotionEvent.time_start is set with time.time(); map it onto perf_counter
+    return time.perf_counter() - max(0.0, time.time() - touch.time_start)
+
+
+def _mean(values):
+    return sum(values) / len(values) if values else 0.0
+
+
+def _sd(values):
+    if len(values) < 2:
+        return 0.0
+    mean = _mean(values)
+    return math.sqrt(sum((v - mean) ** 2 for v in values) / (len(values) - 1))
+
+
+def _percentile(values, fraction):
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+class LatencyProfile:
+    """Measured latencies of one device, in milliseconds."""
+
+    fields = (
+        'input_latency_ms',
+        'display_latency_ms',
+        'extra_input_ms',
+        'jitter_mean_ms',
+        'jitter_sd_ms',
+        'jitter_p95_ms',
+        'jitter_max_ms',
+        'measured_at',
+    )
+
+    def __init__(self, **values):
+        for name in self.fields:
+            setattr(self, name, values.get(name, None if name == 'measured_at' else 0.0))
+
+    @property
+    def correction_ms(self):
+        """Latency subtracted from every recorded reaction time."""
+        return self.extra_input_ms + self.display_latency_ms
+
+    def correct(self, seconds):
+        """Correct a raw stimulus-to-touch-down interval, in seconds."""
+        return max(0.0, seconds - self.correction_ms / 1000)
+
+    def summary(self):
+        if self.extra_input_ms:
+            hardware = f"Touch hardware latency (entered): {self.extra_input_ms:.1f} ms"
+        else:
+            hardware = "Touch hardware latency: not measured; not corrected unless extra_input_ms is set"
+        return "\n".join((
+            f"Display latency: {self.display_latency_ms:.1f} ms",
+            hardware,
+            f"Timing correction applied: {self.correction_ms:.1f} ms",
+            f"Event dispatch delay (not corrected): {self.input_latency_ms:.1f} ms",
+            f"Clock jitter: mean {self.jitter_mean_ms:+.2f} ms, SD {self.jitter_sd_ms:.2f} ms, "
+            f"95th percentile {self.jitter_p95_ms:+.2f} ms, max {self.jitter_max_ms:+.2f} ms",
+        ))
+
+    def to_dict(self):
+        return {name: getattr(self, name) for name in self.fields}
+
+    def save(self, path):
+        with open(path, 'w', encoding='utf-8') as file:
+            json.dump(self.to_dict(), file, indent=2)
+
+    @classmethod
+    def load(cls, path):
+        """Load a stored profile, or return an uncalibrated (zero) profile."""
+        try:
+            with open(path, encoding='utf-8') as file:
+                return cls(**json.load(file))
+        except (OSError, ValueError, TypeError):
+            return cls()
+
+
+class LatencyCalibrator:
+    """
+    Collects latency samples while the calibration screen runs.
+
+    Call show_target() immediately before making the target visible, and
+    record_tap() from the target's touch handler. The calibration is done
+    after `trials` taps.
+    """
+
+    def __init__(self, trials=10):
+        self.trials = trials
+        self.input_samples = []
+        self.display_samples = []
+        self.jitter_samples = []
+        self._flip_requested = None
+        self._tick_event = None
+
+    def start(self):
+        from kivy.core.window import Window
+
+        Window.bind(on_flip=self._on_flip)
+        self._tick_event = Clock.schedule_interval(self._on_tick, JITTER_INTERVAL)
+
+    def stop(self):
+        from kivy.core.window import Window
+
+        Window.unbind(on_flip=self._on_flip)
+        if self._tick_event is not None:
+            self._tick_event.cancel()
+            self._tick_event = None
+
+    @property
+    def done(self):
+        return len(self.input_samples) >= self.trials
+
+    def show_target(self):
+        """Mark the moment the target is changed on screen."""
+        self._flip_requested = time.perf_counter()
+
+    def record_tap(self, touch):
+        """Record the input latency of a tap on the target."""
+        # MotionEvent.time_start is set with time.time() when the event is created
+        self.input_samples.append(max(0.0, time.time() - touch.time_start))
+
+    def _on_flip(self, window):
+        if self._flip_requested is not None:
+            self.display_samples.append(time.perf_counter() - self._flip_requested)
+            self._flip_requested = None
+
+    def _on_tick(self, dt):
+        self.jitter_samples.append(dt - JITTER_INTERVAL)
+
+    def finish(self, extra_input_ms=0.0):
+        """Stop measuring and build the device's profile."""
+        self.stop()
+        jitter_ms = [sample * 1000 for sample in self.jitter_samples]
+        return LatencyProfile(
+            input_latency_ms=_mean(self.input_samples) * 1000,
+            display_latency_ms=_mean(self.display_samples) * 1000,
+            extra_input_ms=extra_input_ms,
+            jitter_mean_ms=_mean(jitter_ms),
+            jitter_sd_ms=_sd(jitter_ms),
+            jitter_p95_ms=_percentile(jitter_ms, 0.95),
+            jitter_max_ms=max(jitter_ms, default=0.0),
+            measured_at=datetime.now().isoformat(timespec='seconds'),
+        )
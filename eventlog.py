@@ -0,0 +1,112 @@
+"""
+CogniScan - Session Event Log
+
+Records every scoring-relevant UI event and timer expiry of a session with
+its time offset, together with each test's generated test data and the
+final scores, so the session can be replayed later (see replay.py). Events
+of a test are named after the test and its controller's handler.
+
+Logs are JSON Lines files:
+
+    {"t": 0.0, "event": "session_start", "session_id": "...", "stimuli": {"battery": [...]}}
+    {"t": 0.0, "event": "test_start", "test": "orientation", "stimuli": {...}}
+    {"t": 12.41, "event": "orientation.handle_submit", "args": ["2026"]}
+    ...
+    {"t": 903.2, "event": "session_end", "scores": {...}}
+"""
+
+import functools
+import json
+import time
+
+
+SESSION_START = 'session_start'
+TEST_START = 'test_start'
+SESSION_END = 'session_end'
+
+
+class EventLog:
+    """In-memory log of one session's events."""
+
+    def __init__(self, entries=None):
+        self.entries = entries if entries is not None else []
+        self.depth = 0
+        self._started = time.monotonic()
+
+    def elapsed(self):
+        """Seconds since the log was started."""
+        return round(time.monotonic() - self._started, 4)
+
+    def start(self, session_id, stimuli):
+        """Begin the log with the session's generated test data."""
+        self._started = time.monotonic()
+        del self.entries[:]
+        self.entries.append({
+            't': 0.0, 'event': SESSION_START, 'session_id': session_id, 'stimuli': stimuli,
+        })
+
+    def start_test(self, test, stimuli):
+        """Record the start of a test with its generated test data."""
+        self.entries.append({'t': self.elapsed(), 'event': TEST_START, 'test': test, 'stimuli': stimuli})
+
+    def record(self, event, args=()):
+        """Append an event and its arguments."""
+        self.entries.append({'t': self.elapsed(), 'event': event, 'args': list(args)})
+
+    def finish(self, scores):
+        """Close the log with the session's final scores."""
+        self.entries.append({'t': self.elapsed(), 'event': SESSION_END, 'scores': scores})
+
+    @property
+    def header(self):
+        """The session_start entry."""
+        return self.entries[0]
+
+    @property
+    def events(self):
+        """The recorded UI and timer events, excluding start and end entries."""
+        return [entry for entry in self.entries if 'args' in entry]
+
+    @property
+    def expected_scores(self):
+        """Final scores recorded at the end of the session, if any."""
+        if self.entries and self.entries[-1]['event'] == SESSION_END:
+            return self.entries[-1]['scores']
+        return None
+
+    def save(self, path):
+        """Write the log as JSON Lines."""
+        with open(path, "w", encoding="utf-8") as file:
+            for entry in self.entries:
+                file.write(json.dumps(entry) + "\n")
+
+    @classmethod
+    def load(cls, path):
+        """Read a log written by save()."""
+        with open(path, encoding="utf-8") as file:
+            return cls([json.loads(line) for line in file if line.strip()])
+
+
+def logged(method):
+    """
+    Record calls to an app or test controller method in the app's event log.
+
+    Calls are recorded under the method's name, prefixed with the object's
+    event_prefix if it has one (e.g. "stroop.handle_button"). Only the
+    outermost logged call is recorded, so handlers that call other logged
+    methods are replayed exactly once. Nothing is recorded when the app has
+    no event log, as during replay. Only logged methods may be replayed.
+    """
+    @functools.wraps(method)
+    def wrapper(self, *args):
+        log = getattr(self, 'event_log', None)
+        if log is None or log.depth:
+            return method(self, *args)
+        log.record(getattr(self, 'event_prefix', '') + method.__name__, args)
+        log.depth += 1
+        try:
+            return method(self, *args)
+        finally:
+            log.depth -= 1
+    wrapper.logged = True
+    return wrapper
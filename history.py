@@ -0,0 +1,330 @@
+"""
+CogniScan - Longitudinal Change Tracking
+
+Keeps a per-participant history of domain scores and measures change across
+repeat screenings:
+
+- Reliable change index (RCI): the difference between a new score and the
+  participant's prior mean, divided by the standard error of the difference,
+  SE_diff = SD * sqrt(2) * sqrt(1 - r). SD is the cohort standard deviation of
+  the domain and r its test-retest reliability. |RCI| >= 1.96 is treated as
+  reliable change. No RCI is given until the cohort has MIN_COHORT_SESSIONS
+  sessions in the domain; an SD estimated from a handful of sessions would
+  flag noise as change.
+- Trend slope: least-squares slope of the participant's scores over time, in
+  points per year.
+
+Each participant's aggregates (count, mean, sum of squared deviations, and
+regression sums) are updated in O(1) per session, so adding a session never
+re-reads the participant's history. Sessions are also appended to a
+per-participant log so the whole cohort can be rebuilt in one batch pass
+with refresh_cohort(), e.g. after changing reliability settings:
+
+    python history.py HISTORY_DIR
+"""
+
+import argparse
+import glob
+import hashlib
+import json
+import math
+import os
+from collections import defaultdict
+from datetime import datetime
+
+
+# Test-retest reliability assumed for every domain unless overridden
+DEFAULT_RELIABILITY = 0.8
+
+# |RCI| at or above this is a reliable change (95% confidence)
+RCI_THRESHOLD = 1.96
+
+# Sessions the cohort needs in a domain before its SD is used for the RCI
+MIN_COHORT_SESSIONS = 30
+
+DAYS_PER_YEAR = 365.25
+
+COHORT_FILE = "cohort.json"
+
+
+# ============================================================================
+# RUNNING AGGREGATES
+# ============================================================================
+
+class RunningStats:
+    """
+    Incremental statistics for one series of (time, score) observations.
+
+    Mean and variance use Welford's update; the slope uses running sums of
+    t, t^2, y and t*y.
+    """
+
+    __slots__ = ('n', 'mean', 'm2', 'st', 'stt', 'sy', 'sty')
+
+    def __init__(self, n=0, mean=0.0, m2=0.0, st=0.0, stt=0.0, sy=0.0, sty=0.0):
+        self.n = n
+        self.mean = mean
+        self.m2 = m2
+        self.st = st
+        self.stt = stt
+        self.sy = sy
+        self.sty = sty
+
+    def add(self, t, y):
+        """Add one observation of score y at time t."""
+        self.n += 1
+        delta = y - self.mean
+        self.mean += delta / self.n
+        self.m2 += delta * (y - self.mean)
+        self.st += t
+        self.stt += t * t
+        self.sy += y
+        self.sty += t * y
+
+    @property
+    def sd(self):
+        """Sample standard deviation, or None with fewer than 2 observations."""
+        if self.n < 2:
+            return None
+        return math.sqrt(self.m2 / (self.n - 1))
+
+    @property
+    def slope(self):
+        """Least-squares slope of score per day, or None if undefined."""
+        # n^2 times the variance of t; require sessions spread over about a day
+        denominator = self.n * self.stt - self.st * self.st
+        if self.n < 2 or denominator < self.n * self.n:
+            return None
+        return (self.n * self.sty - self.st * self.sy) / denominator
+
+    def to_dict(self):
+        return {name: getattr(self, name) for name in self.__slots__}
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(**data)
+
+
+def standard_error_of_difference(sd, reliability):
+    """SE of the difference between two scores on a test."""
+    if sd is None or sd <= 0 or reliability >= 1:
+        return None
+    return sd * math.sqrt(2) * math.sqrt(1 - reliability)
+
+
+# ============================================================================
+# HISTORY INDEX
+# ============================================================================
+
+class HistoryIndex:
+    """
+    Per-participant score history stored in a directory.
+
+    Participants are identified only by participant_key(), a hash of their
+    ID; the raw ID is never stored. For each participant the directory holds
+    <key>.json with the running aggregates per domain and <key>.sessions.jsonl
+    with one line per session.
+    cohort.json holds the pooled aggregates per domain across participants.
+    """
+
+    def __init__(self, directory, reliability=None):
+        self.directory = directory
+        self.reliability = reliability or {}
+        os.makedirs(directory, exist_ok=True)
+        self._cohort = self._read_json(os.path.join(directory, COHORT_FILE), {})
+
+    def reliability_of(self, domain):
+        return self.reliability.get(domain, DEFAULT_RELIABILITY)
+
+    # ------------------------------------------------------------------------
+    # Storage
+    # ------------------------------------------------------------------------
+
+    @staticmethod
+    def participant_key(participant_id):
+        """Filename-safe key for a participant ID."""
+        return hashlib.sha1(participant_id.encode('utf-8')).hexdigest()[:16]
+
+    def _path(self, key, suffix):
+        return os.path.join(self.directory, key + suffix)
+
+    @staticmethod
+    def _read_json(path, default):
+        try:
+            with open(path, encoding='utf-8') as file:
+                return json.load(file)
+        except (OSError, ValueError):
+            return default
+
+    @staticmethod
+    def _write_json(path, data):
+        temp_path = path + '.tmp'
+        with open(temp_path, 'w', encoding='utf-8') as file:
+            json.dump(data, file)
+        os.replace(temp_path, path)
+
+    def load_participant(self, key):
+        """Return the stored aggregates of a participant key, or a new empty entry."""
+        return self._read_json(self._path(key, '.json'), {'first_session': None, 'domains': {}})
+
+    def cohort_stats(self, domain):
+        return RunningStats.from_dict(self._cohort[domain]) if domain in self._cohort else RunningStats()
+
+    # ------------------------------------------------------------------------
+    # Incremental update
+    # ------------------------------------------------------------------------
+
+    def add_session(self, record):
+        """
+        Add a completed session record and return its change report.
+
+        The record needs participant_key, completed_at and domains as produced
+        by DementiaDiagnosisApp.get_session_record(). Returns a dictionary of
+        domain name to change details (see domain_change).
+        """
+        key = record['participant_key']
+        entry = self.load_participant(key)
+        if entry['first_session'] is None:
+            entry['first_session'] = record['completed_at']
+        t = days_between(entry['first_session'], record['completed_at'])
+
+        changes = {}
+        for domain in record['domains']:
+            name, score = domain['name'], domain['score']
+            stats = RunningStats.from_dict(entry['domains'][name]) if name in entry['domains'] else RunningStats()
+            cohort = self.cohort_stats(name)
+
+            changes[name] = domain_change(score, stats, cohort, self.reliability_of(name), t)
+            stats.add(t, score)
+            cohort.add(0.0, score)
+            entry['domains'][name] = stats.to_dict()
+            self._cohort[name] = cohort.to_dict()
+            changes[name]['slope_per_year'] = _per_year(stats.slope)
+
+        with open(self._path(key, '.sessions.jsonl'), 'a', encoding='utf-8') as file:
+            file.write(json.dumps({
+                'completed_at': record['completed_at'],
+                'scores': {domain['name']: domain['score'] for domain in record['domains']},
+            }) + '\n')
+        self._write_json(self._path(key, '.json'), entry)
+        self._write_json(os.path.join(self.directory, COHORT_FILE), self._cohort)
+        return changes
+
+    # ------------------------------------------------------------------------
+    # Batch refresh
+    # ------------------------------------------------------------------------
+
+    def refresh_cohort(self):
+        """
+        Rebuild every participant's and the cohort's aggregates from the
+        session logs in one pass. Returns the number of participants.
+        """
+        participants = {}
+        cohort = defaultdict(RunningStats)
+
+        for log_path in glob.glob(os.path.join(self.directory, '*.sessions.jsonl')):
+            key = os.path.basename(log_path)[:-len('.sessions.jsonl')]
+            entry_path = os.path.join(self.directory, key + '.json')
+            entry = self._read_json(entry_path, None)
+            if entry is None:
+                continue
+            with open(log_path, encoding='utf-8') as file:
+                sessions = sorted((json.loads(line) for line in file if line.strip()),
+                                  key=lambda session: session['completed_at'])
+            if not sessions:
+                continue
+
+            # Columns per domain: times and scores
+            first = sessions[0]['completed_at']
+            columns = defaultdict(lambda: ([], []))
+            for session in sessions:
+                t = days_between(first, session['completed_at'])
+                for name, score in session['scores'].items():
+                    columns[name][0].append(t)
+                    columns[name][1].append(score)
+
+            entry['first_session'] = first
+            entry['domains'] = {}
+            for name, (times, scores) in columns.items():
+                stats = stats_from_columns(times, scores)
+                entry['domains'][name] = stats.to_dict()
+                for score in scores:
+                    cohort[name].add(0.0, score)
+            participants[entry_path] = entry
+
+        for entry_path, entry in participants.items():
+            self._write_json(entry_path, entry)
+        self._cohort = {name: stats.to_dict() for name, stats in cohort.items()}
+        self._write_json(os.path.join(self.directory, COHORT_FILE), self._cohort)
+        return len(participants)
+
+
+def stats_from_columns(times, scores):
+    """Build RunningStats for a whole series at once from parallel columns."""
+    n = len(scores)
+    mean = math.fsum(scores) / n
+    return RunningStats(
+        n=n,
+        mean=mean,
+        m2=math.fsum((y - mean) ** 2 for y in scores),
+        st=math.fsum(times),
+        stt=math.fsum(t * t for t in times),
+        sy=math.fsum(scores),
+        sty=math.fsum(t * y for t, y in zip(times, scores)),
+    )
+
+
+def domain_change(score, prior, cohort, reliability, t):
+    """
+    Change details for a new domain score against the participant's prior
+    aggregates. rci is None when there are no prior sessions or the cohort
+    has fewer than MIN_COHORT_SESSIONS sessions to estimate SD from.
+    """
+    rci = None
+    if prior.n and cohort.n >= MIN_COHORT_SESSIONS:
+        se_diff = standard_error_of_difference(cohort.sd, reliability)
+        if se_diff:
+            rci = (score - prior.mean) / se_diff
+    return {
+        'score': score,
+        'prior_sessions': prior.n,
+        'prior_mean': prior.mean if prior.n else None,
+        'rci': rci,
+        'reliable_change': rci is not None and abs(rci) >= RCI_THRESHOLD,
+        'days_since_first': t,
+    }
+
+
+def days_between(start, end):
+    """Days between two ISO timestamps."""
+    delta = datetime.fromisoformat(end) - datetime.fromisoformat(start)
+    return delta.total_seconds() / 86400
+
+
+def _per_year(slope_per_day):
+    return slope_per_day * DAYS_PER_YEAR if slope_per_day is not None else None
+
+
+def format_changes(changes):
+    """One line per domain describing change since prior sessions."""
+    lines = []
+    for name, change in changes.items():
+        if not change['prior_sessions']:
+            continue
+        line = f"{name}: {change['score']} vs prior mean {change['prior_mean']:.1f}"
+        if change['rci'] is not None:
+            line += f", RCI {change['rci']:+.2f}"
+            if change['reliable_change']:
+                line += " (reliable change)"
+        if change['slope_per_year'] is not None:
+            line += f", trend {change['slope_per_year']:+.1f}/yr"
+        lines.append(line)
+    return "\n".join(lines)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Rebuild CogniScan longitudinal aggregates.")
+    parser.add_argument('history_dir')
+    args = parser.parse_args()
+    count = HistoryIndex(args.history_dir).refresh_cohort()
+    print("%d participant(s) refreshed" % count)
@@ -0,0 +1,203 @@
+"""
+CogniScan - Session Lifecycle Management
+
+Owns every Clock event and per-session buffer used during an assessment so
+they can be released deterministically when the assessment is restarted.
+Long-running kiosks restart the assessment many times a day; anything left
+scheduled or reallocated on each cycle accumulates for the life of the
+process.
+
+Run this module directly to perform a soak test of repeated restart cycles:
+
+    python lifecycle.py --cycles 5000 --report-every 500
+"""
+
+import argparse
+import gc
+import os
+import sys
+
+if __name__ == '__main__':
+    # Keep Kivy from parsing the soak-test command-line options
+    os.environ.setdefault('KIVY_NO_ARGS', '1')
+
+from kivy.clock import Clock
+
+
+class SessionLifecycle:
+    """
+    Registry of the timers and buffers belonging to one assessment session.
+
+    Timers are held in named slots: scheduling a timer into an occupied slot
+    cancels the previous event first, so at most one event per slot is ever
+    pending. Buffers are lists owned by other objects (typically Kivy
+    ListProperty values on the test controllers) that are emptied in place
+    on release rather than replaced, so the same list objects are reused
+    across sessions.
+    """
+
+    def __init__(self, owner=None, buffer_names=()):
+        self._buffers = []
+        self._events = {}
+        if owner is not None:
+            self.add_buffers(owner, buffer_names)
+
+    # ========================================================================
+    # TIMERS
+    # ========================================================================
+
+    def schedule_interval(self, name, callback, interval):
+        """Schedule a repeating callback in the named slot."""
+        self.cancel(name)
+        event = Clock.schedule_interval(callback, interval)
+        self._events[name] = event
+        return event
+
+    def schedule_once(self, name, callback, timeout=0):
+        """Schedule a one-shot callback in the named slot."""
+        self.cancel(name)
+        event = Clock.schedule_once(callback, timeout)
+        self._events[name] = event
+        return event
+
+    def cancel(self, name):
+        """Cancel the event in the named slot, if any."""
+        event = self._events.pop(name, None)
+        if event is not None:
+            event.cancel()
+
+    # ========================================================================
+    # BUFFERS
+    # ========================================================================
+
+    def add_buffers(self, owner, buffer_names):
+        """Register lists held in the named attributes of owner."""
+        if buffer_names:
+            self._buffers.append((owner, tuple(buffer_names)))
+
+    def clear_buffers(self):
+        """Empty every registered buffer in place."""
+        for owner, names in self._buffers:
+            for name in names:
+                del getattr(owner, name)[:]
+
+    # ========================================================================
+    # RELEASE
+    # ========================================================================
+
+    def release(self):
+        """Cancel all timers and empty all buffers."""
+        for name in list(self._events):
+            self.cancel(name)
+        self.clear_buffers()
+
+
+# ============================================================================
+# SOAK TEST
+# ============================================================================
+
+def current_rss_kb():
+    """Return the resident set size of this process in kilobytes."""
+    try:
+        with open('/proc/self/statm') as statm:
+            pages = int(statm.read().split()[1])
+        return pages * os.sysconf('SC_PAGE_SIZE') // 1024
+    except (OSError, ValueError, IndexError, AttributeError):
+        pass
+    try:
+        import resource
+    except ImportError:
+        return 0
+    # Peak RSS is the best portable fallback (bytes on macOS, kB elsewhere)
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak // 1024 if sys.platform == 'darwin' else peak
+
+
+def pending_clock_events():
+    """Return the number of events currently scheduled on the Kivy Clock."""
+    return len(Clock.get_events())
+
+
+def run_session(app):
+    """
+    Drive a headless app through one assessment: every test's timer and
+    answer handlers, then the final results.
+    """
+    orientation = app.begin_test('orientation')
+    for _ in orientation.questions:
+        orientation.handle_submit("unknown")
+
+    recall = app.begin_test('immediate_recall')
+    recall.start_display_timer()
+    recall.on_display_timeout()
+    recall.calculate_recall(" ".join(recall.words[:3]))
+
+    app.begin_test('serial7s').calculate("93 86 79")
+
+    # Wrong answers end each digit span direction after one attempt
+    digit_span = app.begin_test('digit_span')
+    digit_span.handle_forward_submit("0")
+    digit_span.handle_backward_submit("0")
+
+    fluency = app.begin_test('category_fluency')
+    fluency.start_timer()
+    for i in range(20):
+        fluency.add_animal("animal%d" % i)
+    fluency.on_timeout()
+
+    stroop = app.begin_test('stroop')
+    stroop.start_timer()
+    for trial in list(stroop.trials):
+        stroop.handle_button(trial['ink_color'])
+
+    app.begin_test('delayed_recall').calculate_recall(" ".join(recall.words[:2]))
+    app.calculate_final_results()
+
+
+def soak_test(cycles=1000, report_every=100, out=sys.stdout):
+    """
+    Run repeated session/restart cycles of the app and report resource usage.
+
+    Each cycle runs a whole assessment on a windowless app instance (see
+    run_session), advances the Clock once and then calls the app's
+    restart_assessment(). Returns a list of (cycle, rss_kb, live_objects,
+    pending_events) samples.
+    """
+    from replay import headless_app
+
+    app = headless_app()
+    samples = []
+
+    def sample(cycle):
+        gc.collect()
+        row = (cycle, current_rss_kb(), len(gc.get_objects()), pending_clock_events())
+        samples.append(row)
+        out.write("cycle %7d  rss %8d kB  objects %8d  clock events %4d\n" % row)
+        return row
+
+    # Warm up once so imports and first-use caches are not counted as growth
+    run_session(app)
+    app.restart_assessment()
+
+    baseline = sample(0)
+    for cycle in range(1, cycles + 1):
+        run_session(app)
+        Clock.tick()
+        app.restart_assessment()
+        if cycle % report_every == 0 or cycle == cycles:
+            sample(cycle)
+
+    final = samples[-1]
+    out.write(
+        "\n%d cycles: rss %+d kB, objects %+d, clock events %+d\n"
+        % (cycles, final[1] - baseline[1], final[2] - baseline[2], final[3] - baseline[3])
+    )
+    return samples
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Soak-test CogniScan restart cycles.")
+    parser.add_argument('--cycles', type=int, default=1000)
+    parser.add_argument('--report-every', type=int, default=100)
+    args = parser.parse_args()
+    soak_test(args.cycles, args.report_every)
@@ -12,13 +12,27 @@ by qualified healthcare professionals only.
 
 import random
 import os
+import uuid
 from datetime import datetime
+
+# Let scheduled events (e.g. from report workers) interrupt the idle sleep
+os.environ.setdefault('KIVY_CLOCK', 'interrupt')
+
 from kivy.app import App
 from kivy.uix.screenmanager import ScreenManager, Screen
 from kivy.lang import Builder
 from kivy.properties import StringProperty, NumericProperty, ListProperty, BooleanProperty
-from kivy.clock import Clock
-from kivy.core.window import Window
+from kivy.clock import mainthread
+from kivy.logger import Logger
+
+from calibration import LatencyCalibrator, LatencyProfile
+from battery import DEFAULT_BATTERY, get_plugin, load_screens, parse_battery
+from eventlog import EventLog, logged
+from history import HistoryIndex, format_changes
+from lifecycle import SessionLifecycle
+from power import IdleRenderer, CpuMeter
+from reports import ReportGenerator
+from session_codec import RECORD_EXTENSION, save_record
 
 
 # ============================================================================
@@ -35,138 +49,11 @@ class DescriptionScreen(Screen):
     pass
 
 
-class OrientationIntroScreen(Screen):
-    """Introduction to orientation questions."""
-    pass
-
-
-class OrientationScreen(Screen):
-    """Orientation questions testing awareness of time."""
-    current_question = StringProperty("")
-    question_number = NumericProperty(0)
-    pass
-
-
-class OrientationScoreScreen(Screen):
-    """Display orientation test score."""
-    orientation_score = StringProperty("0/5")
-    pass
-
-
-class FiveWordsIntroScreen(Screen):
-    """Introduction to immediate word recall test."""
-    pass
-
-
-class FiveWordsScreen(Screen):
-    """Display 5 words for memorization."""
-    countdown = StringProperty("10")
-    pass
-
-
-class ImmediateRecallScreen(Screen):
-    """User enters words they remember immediately."""
-    pass
-
-
-class ImmediateRecallScoreScreen(Screen):
-    """Display immediate recall score."""
-    immediate_score = StringProperty("0/5")
-    pass
-
-
-class Serial7sIntroScreen(Screen):
-    """Introduction to Serial 7s test."""
-    pass
-
-
-class Serial7sScreen(Screen):
-    """Serial 7s subtraction test."""
-    pass
-
-
-class Serial7sScoreScreen(Screen):
-    """Display Serial 7s score."""
-    serial7s_score = StringProperty("0/5")
-    pass
-
-
-class DigitSpanIntroScreen(Screen):
-    """Introduction to digit span test."""
-    pass
-
-
-class DigitSpanForwardScreen(Screen):
-    """Forward digit span test."""
-    digits_to_remember = StringProperty("")
-    current_level = NumericProperty(3)
-    pass
-
-
-class DigitSpanBackwardScreen(Screen):
-    """Backward digit span test."""
-    digits_to_remember = StringProperty("")
-    current_level = NumericProperty(2)
-    pass
-
-
-class DigitSpanScoreScreen(Screen):
-    """Display digit span score."""
-    digit_span_score = StringProperty("0/4")
-    pass
-
-
-class CategoryFluencyIntroScreen(Screen):
-    """Introduction to category fluency test."""
-    pass
-
-
-class CategoryFluencyScreen(Screen):
-    """Category fluency test - name animals."""
-    timer = StringProperty("60")
-    pass
-
-
-class CategoryFluencyScoreScreen(Screen):
-    """Display category fluency score."""
-    fluency_score = StringProperty("0/3")
-    animals_count = StringProperty("0")
-    pass
-
-
-class StroopTestIntroScreen(Screen):
-    """Introduction to Stroop test."""
-    pass
-
-
-class StroopTestScreen(Screen):
-    """Stroop color-word test."""
-    word_text = StringProperty("RED")
-    word_color = ListProperty([1, 0, 0, 1])
-    trial_number = NumericProperty(1)
-    timer = StringProperty("30")
-    pass
-
-
-class StroopScoreScreen(Screen):
-    """Display Stroop test score."""
-    stroop_score = StringProperty("0/5")
-    pass
-
-
-class DelayedRecallIntroScreen(Screen):
-    """Introduction to delayed recall test."""
-    pass
-
-
-class DelayedRecallScreen(Screen):
-    """User tries to recall the 5 words from earlier."""
-    pass
-
-
-class DelayedRecallScoreScreen(Screen):
-    """Display delayed recall score."""
-    delayed_score = StringProperty("0/5")
+class CalibrationScreen(Screen):
+    """Device latency calibration: tap the target each time it lights up."""
+    target_active = BooleanProperty(False)
+    progress = StringProperty("")
+    summary = StringProperty("")
     pass
 
 
@@ -175,6 +62,9 @@ class ResultsScreen(Screen):
     total_score = StringProperty("0/30")
     score_category = StringProperty("")
     interpretation = StringProperty("")
+    score_breakdown = StringProperty("")
+    report_status = StringProperty("")
+    change_summary = StringProperty("")
     pass
 
 
@@ -191,7 +81,9 @@ class DementiaDiagnosisApp(App):
     """
     Main application class implementing a comprehensive cognitive assessment.
 
-    The assessment includes:
+    The tests making up the assessment are plugins in the battery package,
+    loaded as their phase approaches; each test's state and handlers live
+    in its plugin's controller (see test()). The default battery includes:
     - Orientation (5 points): Awareness of current date/time
     - Immediate Word Recall (5 points): Remember 5 words immediately
     - Serial 7s (5 points): Subtract 7 from 100 repeatedly
@@ -200,569 +92,265 @@ class DementiaDiagnosisApp(App):
     - Stroop Test (5 points): Color-word interference
     - Delayed Word Recall (5 points): Recall words from earlier
 
-    Total: 32 points (normalized to 30 for interpretation)
+    Total: 32 points (normalized to 30 for interpretation). Custom batteries
+    are normalized to 30 over the maximum points of the tests they include.
     """
 
-    # ========================================================================
-    # SCORE TRACKING
-    # ========================================================================
+    # Display properties
+    phase_label = StringProperty("")
+    next_step_label = StringProperty("")
 
-    # Individual test scores
-    orientation_score = NumericProperty(0)
-    immediate_recall_score = NumericProperty(0)
-    serial7s_score = NumericProperty(0)
-    digit_span_forward_score = NumericProperty(0)
-    digit_span_backward_score = NumericProperty(0)
-    fluency_score = NumericProperty(0)
-    stroop_score = NumericProperty(0)
-    delayed_recall_score = NumericProperty(0)
+    # Optional ID linking repeat sessions of the same participant
+    participant_id = StringProperty("")
+    history = None
 
-    # Display properties
-    recent_animals_text = StringProperty("None yet")
-    animals_count_text = StringProperty("0")
+    # Idle-aware rendering and its CPU measurement harness
+    idle_renderer = None
+    cpu_meter = None
 
     # ========================================================================
-    # TEST STATE VARIABLES
+    # TEST BATTERY
     # ========================================================================
 
-    # Word memorization
-    words = ListProperty([])
-    checked_words_immediate = ListProperty([])
-    checked_words_delayed = ListProperty([])
-
-    # Serial 7s
-    serial7_correct = ["93", "86", "79", "72", "65"]
-    checked_numbers = ListProperty([])
-
-    # Orientation
-    orientation_questions = ListProperty([])
-    orientation_answers = ListProperty([])
-    current_orientation_index = NumericProperty(0)
+    # Names of the tests to run, in order (see battery.AVAILABLE_TESTS)
+    battery = ListProperty(list(DEFAULT_BATTERY))
+    battery_index = NumericProperty(-1)
 
-    # Digit span
-    forward_digits = ListProperty([])
-    backward_digits = ListProperty([])
-    digit_forward_passed = BooleanProperty(False)
-    digit_backward_passed = BooleanProperty(False)
+    # Set when the participant starts the first test (see start_battery)
+    session_started_at = None
 
-    # Category fluency
-    animals_entered = ListProperty([])
-    fluency_timer_event = None
+    # Normalized score and record of the completed session, set when results
+    # are calculated
+    final_score = None
+    session_record = None
 
-    # Stroop test
-    stroop_trials = ListProperty([])
-    stroop_current_trial = NumericProperty(0)
-    stroop_correct = NumericProperty(0)
-    stroop_timer_event = None
+    # Device latency profile used to correct recorded timings
+    latency_profile = None
+    calibrator = None
 
-    # Timers
-    word_display_timer = None
+    # Event log of the current session (see eventlog.py)
+    event_log = None
 
     # ========================================================================
     # APPLICATION LIFECYCLE
     # ========================================================================
 
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        # Test name -> TestController, created when each test is first needed
+        self.tests = {}
+
+    def build_config(self, config):
+        """Default configuration, overridden by the app's .ini file."""
+        config.setdefaults('assessment', {
+            'battery': ', '.join(DEFAULT_BATTERY),
+        })
+        config.setdefaults('power', {
+            'idle_rendering': 1,
+            'measure_cpu': 0,
+        })
+
     def build(self):
         """Initialize the application."""
         self.title = "CogniScan"
+        self.battery = self.load_battery()
+        self.lifecycle = SessionLifecycle()
+        self.report_generator = ReportGenerator()
+        self.history = HistoryIndex(os.path.join(self.user_data_dir, "history"))
+        self.latency_profile = LatencyProfile.load(self.latency_profile_path)
         self.initialize_tests()
         return Builder.load_file('cogniscan.kv')
 
-    def initialize_tests(self):
-        """Set up all test data."""
-        # Generate words for memorization
-        self.words = self.generate_random_words()
-
-        # Set up orientation questions
-        self.setup_orientation_questions()
-
-        # Set up digit span sequences
-        self.setup_digit_span()
-
-        # Set up Stroop test trials
-        self.setup_stroop_test()
-
-    def on_start(self):
-        """Called when the app starts - set up initial screen data."""
-        # Set up the five words display
-        screen = self.root.get_screen('fivewords')
-        for i, word in enumerate(self.words, 1):
-            word_label = screen.ids.get(f'word{i}')
-            if word_label:
-                word_label.text = word.upper()
-
-    # ========================================================================
-    # WORD GENERATION
-    # ========================================================================
-
-    def generate_random_words(self):
-        """Generate 5 random words from the word bank."""
+    def load_battery(self):
+        """Read the configured battery, falling back to the default if it is invalid."""
         try:
-            # Get the directory where main.py is located
-            script_dir = os.path.dirname(os.path.abspath(__file__))
-            words_path = os.path.join(script_dir, "words.txt")
-
-            with open(words_path, "r") as file:
-                word_list = [w.strip() for w in file.read().splitlines() if w.strip()]
-
-            # Filter for good memorization words (4-8 letters, concrete nouns preferred)
-            good_words = [w for w in word_list if 4 <= len(w) <= 8 and w.isalpha()]
-
-            if len(good_words) < 5:
-                good_words = word_list
-
-            random.shuffle(good_words)
-            return good_words[:5]
-        except FileNotFoundError:
-            # Fallback words if file not found
-            return ["apple", "table", "penny", "garden", "finger"]
-
-    # ========================================================================
-    # ORIENTATION TEST
-    # ========================================================================
-
-    def setup_orientation_questions(self):
-        """Set up orientation questions based on current date."""
-        now = datetime.now()
-
-        # Season calculation
-        month = now.month
-        if month in [12, 1, 2]:
-            season = "winter"
-        elif month in [3, 4, 5]:
-            season = "spring"
-        elif month in [6, 7, 8]:
-            season = "summer"
-        else:
-            season = "fall"
-
-        # Day of week
-        days = ["monday", "tuesday", "wednesday", "thursday", "friday", "saturday", "sunday"]
-        day_of_week = days[now.weekday()]
-
-        # Month name
-        months = ["january", "february", "march", "april", "may", "june",
-                  "july", "august", "september", "october", "november", "december"]
-        month_name = months[now.month - 1]
-
-        self.orientation_questions = [
-            "What year is it?",
-            "What month is it?",
-            "What day of the week is it?",
-            "What is today's date (day number)?",
-            "What season is it?"
-        ]
-
-        self.orientation_answers = [
-            str(now.year),
-            month_name,
-            day_of_week,
-            str(now.day),
-            season
-        ]
-
-        self.current_orientation_index = 0
-
-    def get_current_orientation_question(self):
-        """Get the current orientation question."""
-        if self.current_orientation_index < len(self.orientation_questions):
-            return self.orientation_questions[self.current_orientation_index]
-        return ""
-
-    def check_orientation_answer(self, user_answer):
-        """Check if the orientation answer is correct."""
-        if self.current_orientation_index >= len(self.orientation_answers):
-            return False
-
-        correct = self.orientation_answers[self.current_orientation_index].lower()
-        answer = user_answer.strip().lower()
-
-        # Allow some flexibility in answers
-        is_correct = (answer == correct or
-                      answer in correct or
-                      correct in answer or
-                      (answer.isdigit() and correct.isdigit() and int(answer) == int(correct)))
-
-        if is_correct:
-            self.orientation_score += 1
-
-        self.current_orientation_index += 1
-
-        # Update the screen
-        screen = self.root.get_screen('orientation')
-        if self.current_orientation_index < len(self.orientation_questions):
-            screen.current_question = self.orientation_questions[self.current_orientation_index]
-            screen.question_number = self.current_orientation_index + 1
-            return True  # More questions
-        else:
-            return False  # All questions done
-
-    def finish_orientation(self):
-        """Finish orientation test and display score."""
-        screen = self.root.get_screen('orientationscore')
-        screen.orientation_score = f"{self.orientation_score}/5"
-
-    # ========================================================================
-    # IMMEDIATE WORD RECALL
-    # ========================================================================
-
-    def start_word_display_timer(self, duration=10):
-        """Start countdown timer for word display."""
-        screen = self.root.get_screen('fivewords')
-        screen.countdown = str(duration)
-
-        def update_countdown(dt):
-            current = int(screen.countdown)
-            if current > 0:
-                screen.countdown = str(current - 1)
-            else:
-                # Auto-advance to recall screen
-                self.word_display_timer.cancel()
-                self.root.current = 'immediaterecall'
-
-        self.word_display_timer = Clock.schedule_interval(update_countdown, 1)
-
-    def cancel_word_timer(self):
-        """Cancel the word display timer if active."""
-        if self.word_display_timer:
-            self.word_display_timer.cancel()
-            self.word_display_timer = None
-
-    def calculate_immediate_recall(self, input_words):
-        """Calculate score for immediate word recall."""
-        words_list = input_words.lower().replace(',', ' ').split()
-
-        for word in words_list:
-            word = word.strip()
-            if word in [w.lower() for w in self.words] and word not in self.checked_words_immediate:
-                self.immediate_recall_score += 1
-                self.checked_words_immediate.append(word)
-
-        return f"{self.immediate_recall_score}/5"
-
-    def finish_immediate_recall(self):
-        """Display immediate recall score."""
-        screen = self.root.get_screen('immediaterecallscore')
-        screen.immediate_score = f"{self.immediate_recall_score}/5"
-
-    # ========================================================================
-    # SERIAL 7s TEST
-    # ========================================================================
-
-    def calculate_serial7s(self, input_nums):
-        """Calculate Serial 7s score."""
-        nums_list = input_nums.replace(',', ' ').split()
-
-        for num in nums_list:
-            num = num.strip()
-            if num in self.serial7_correct and num not in self.checked_numbers:
-                self.serial7s_score += 1
-                self.checked_numbers.append(num)
+            return parse_battery(self.config.get('assessment', 'battery'))
+        except ValueError as error:
+            # A typo in the .ini file must not stop the kiosk from starting
+            Logger.error("Battery: %s; using the default battery", error)
+            return list(DEFAULT_BATTERY)
 
-        return f"{self.serial7s_score}/5"
-
-    def finish_serial7s(self):
-        """Display Serial 7s score."""
-        screen = self.root.get_screen('serial7sscore')
-        screen.serial7s_score = f"{self.serial7s_score}/5"
-
-    # ========================================================================
-    # DIGIT SPAN TEST
-    # ========================================================================
+    def initialize_tests(self):
+        """Start a new session; each test draws its data as it begins."""
+        # Identify this session for saved records and reports
+        self.session_id = datetime.now().strftime("%Y%m%d-%H%M%S-") + uuid.uuid4().hex[:6]
+
+        for test in self.tests.values():
+            test.reset()
+
+        self.battery_index = -1
+
+        # The log starts when the participant begins (see start_battery)
+        self.event_log = None
+
+    def test(self, name):
+        """Get a test's controller, importing its plugin module if needed."""
+        if name not in self.tests:
+            test = get_plugin(name).controller(self, name)
+            self.lifecycle.add_buffers(test, test.session_buffers)
+            self.tests[name] = test
+        return self.tests[name]
+
+    def get_stimuli(self):
+        """Get the session's generated test data as a plain dictionary."""
+        stimuli = {'battery': list(self.battery)}
+        for name in self.battery:
+            if name in self.tests:
+                stimuli.update(self.tests[name].stimuli)
+        return stimuli
 
-    def setup_digit_span(self):
-        """Generate digit sequences for digit span test."""
-        # Forward digits - start with 3 digits
-        self.forward_digits = [random.randint(1, 9) for _ in range(5)]
-        # Backward digits - start with 2 digits
-        self.backward_digits = [random.randint(1, 9) for _ in range(4)]
-
-    def get_forward_digits(self, level):
-        """Get forward digit sequence for given level."""
-        return ' - '.join(str(d) for d in self.forward_digits[:level])
-
-    def get_backward_digits(self, level):
-        """Get backward digit sequence for given level."""
-        return ' - '.join(str(d) for d in self.backward_digits[:level])
-
-    def check_forward_digits(self, user_input, level):
-        """Check forward digit recall."""
-        user_digits = [d.strip() for d in user_input.replace('-', ' ').replace(',', ' ').split() if d.strip().isdigit()]
-        correct_digits = [str(d) for d in self.forward_digits[:level]]
-
-        if user_digits == correct_digits:
-            self.digit_span_forward_score += 1
-            return True
-        return False
-
-    def check_backward_digits(self, user_input, level):
-        """Check backward digit recall."""
-        user_digits = [d.strip() for d in user_input.replace('-', ' ').replace(',', ' ').split() if d.strip().isdigit()]
-        correct_digits = [str(d) for d in reversed(self.backward_digits[:level])]
-
-        if user_digits == correct_digits:
-            self.digit_span_backward_score += 1
-            return True
-        return False
-
-    def handle_forward_submit(self, user_input):
-        """Handle forward digit span submission."""
-        screen = self.root.get_screen('digitspanforward')
-        level = screen.current_level
-        passed = self.check_forward_digits(user_input, level)
-
-        if passed and level < 4:
-            screen.current_level = level + 1
-            screen.digits_to_remember = self.get_forward_digits(screen.current_level)
-        else:
-            backward_screen = self.root.get_screen('digitspanbackward')
-            backward_screen.digits_to_remember = self.get_backward_digits(2)
-            backward_screen.current_level = 2
-            self.root.current = "digitspanbackward"
-
-    def handle_backward_submit(self, user_input):
-        """Handle backward digit span submission."""
-        screen = self.root.get_screen('digitspanbackward')
-        level = screen.current_level
-        passed = self.check_backward_digits(user_input, level)
-
-        if passed and level < 3:
-            screen.current_level = level + 1
-            screen.digits_to_remember = self.get_backward_digits(screen.current_level)
-        else:
-            self.finish_digit_span()
-            self.root.current = "digitspanscore"
-
-    def handle_stroop_button(self, color):
-        """Handle Stroop test button press."""
-        has_more = self.check_stroop_answer(color)
-        if not has_more:
-            self.finish_stroop()
-            self.root.current = "stroopscore"
-
-    def handle_orientation_submit(self, answer):
-        """Handle orientation answer submission."""
-        has_more = self.check_orientation_answer(answer)
-        if not has_more:
-            self.finish_orientation()
-            self.root.current = "orientationscore"
-
-    def finish_digit_span(self):
-        """Calculate and display digit span score."""
-        total = self.digit_span_forward_score + self.digit_span_backward_score
-        # Max 2 points for forward (levels 3,4), 2 points for backward (levels 2,3)
-        screen = self.root.get_screen('digitspanscore')
-        screen.digit_span_score = f"{min(total, 4)}/4"
+    def on_start(self):
+        """Called when the app starts - load the first test in the battery."""
+        if self.config.getboolean('power', 'idle_rendering'):
+            self.idle_renderer = IdleRenderer(self.root)
+            self.idle_renderer.attach()
+            self.idle_renderer.add_timed_screens(['calibration'])
+        if self.config.getboolean('power', 'measure_cpu'):
+            # Without idle rendering every minute counts as active: the baseline
+            self.cpu_meter = CpuMeter(self.idle_renderer)
+            self.cpu_meter.start()
+
+        self.load_test(0)
+
+    def on_stop(self):
+        """Release any timers still pending when the app closes."""
+        self.cancel_calibration()
+        self.lifecycle.release()
+        self.report_generator.shutdown(wait=False)
+        if self.cpu_meter is not None:
+            self.cpu_meter.stop()
 
     # ========================================================================
-    # CATEGORY FLUENCY TEST
+    # DEVICE CALIBRATION
     # ========================================================================
 
-    def start_fluency_timer(self, duration=60):
-        """Start the 60-second fluency timer."""
-        screen = self.root.get_screen('categoryfluency')
-        screen.timer = str(duration)
-
-        def update_timer(dt):
-            current = int(screen.timer)
-            if current > 0:
-                screen.timer = str(current - 1)
-            else:
-                self.fluency_timer_event.cancel()
-                self.finish_fluency()
-                self.root.current = 'fluencyscore'
-
-        self.fluency_timer_event = Clock.schedule_interval(update_timer, 1)
-
-    def cancel_fluency_timer(self):
-        """Cancel fluency timer."""
-        if self.fluency_timer_event:
-            self.fluency_timer_event.cancel()
-            self.fluency_timer_event = None
-
-    def add_animal(self, animal):
-        """Add an animal to the list."""
-        animal = animal.strip().lower()
-        if animal and animal not in self.animals_entered and len(animal) > 1:
-            self.animals_entered.append(animal)
-            # Update display properties
-            self.animals_count_text = str(len(self.animals_entered))
-            self.recent_animals_text = ", ".join(self.animals_entered[-5:])
-
-    def finish_fluency(self):
-        """Calculate and display fluency score."""
-        count = len(self.animals_entered)
-
-        # Scoring based on normative data:
-        # 15+ animals = 3 points
-        # 10-14 animals = 2 points
-        # 5-9 animals = 1 point
-        # <5 animals = 0 points
-        if count >= 15:
-            self.fluency_score = 3
-        elif count >= 10:
-            self.fluency_score = 2
-        elif count >= 5:
-            self.fluency_score = 1
-        else:
-            self.fluency_score = 0
+    @property
+    def latency_profile_path(self):
+        return os.path.join(self.user_data_dir, "latency_profile.json")
+
+    def start_calibration(self):
+        """Begin measuring input, display and Clock latency."""
+        screen = self.root.get_screen('calibration')
+        screen.summary = ""
+        screen.target_active = False
+        self.calibrator = LatencyCalibrator()
+        self.calibrator.start()
+        screen.progress = f"0/{self.calibrator.trials}"
+        self.schedule_calibration_target()
+
+    def schedule_calibration_target(self):
+        """Light up the target after a random delay."""
+        self.lifecycle.schedule_once(
+            'calibration', self.show_calibration_target, random.uniform(0.8, 2.0)
+        )
 
-        screen = self.root.get_screen('fluencyscore')
-        screen.fluency_score = f"{self.fluency_score}/3"
-        screen.animals_count = str(count)
+    def show_calibration_target(self, dt):
+        """Light up the target."""
+        self.calibrator.show_target()
+        self.root.get_screen('calibration').target_active = True
+
+    def calibration_tap(self, touch):
+        """Handle a tap on the calibration target."""
+        screen = self.root.get_screen('calibration')
+        if self.calibrator is None or not screen.target_active:
+            return
+        self.calibrator.record_tap(touch)
+        screen.target_active = False
+        screen.progress = f"{len(self.calibrator.input_samples)}/{self.calibrator.trials}"
+
+        if not self.calibrator.done:
+            self.schedule_calibration_target()
+            return
+
+        # Keep any externally measured input latency from the previous profile
+        self.latency_profile = self.calibrator.finish(self.latency_profile.extra_input_ms)
+        self.latency_profile.save(self.latency_profile_path)
+        self.calibrator = None
+        screen.summary = self.latency_profile.summary()
+
+    def cancel_calibration(self):
+        """Stop a calibration in progress without saving."""
+        self.lifecycle.cancel('calibration')
+        if self.calibrator is not None:
+            self.calibrator.stop()
+            self.calibrator = None
 
     # ========================================================================
-    # STROOP TEST
+    # BATTERY FLOW
     # ========================================================================
 
-    def setup_stroop_test(self):
-        """Set up Stroop test trials."""
-        colors = {
-            'red': [1, 0.2, 0.2, 1],
-            'blue': [0.2, 0.4, 1, 1],
-            'green': [0.2, 0.8, 0.2, 1],
-            'yellow': [0.9, 0.9, 0.2, 1]
-        }
-
-        color_names = list(colors.keys())
-
-        # Create 10 trials - mix of congruent and incongruent
-        self.stroop_trials = []
-        for i in range(10):
-            word = random.choice(color_names)
-            # 70% incongruent trials (word doesn't match ink color)
-            if random.random() < 0.7:
-                ink_color = random.choice([c for c in color_names if c != word])
-            else:
-                ink_color = word
-
-            self.stroop_trials.append({
-                'word': word.upper(),
-                'ink_color': ink_color,
-                'color_rgba': colors[ink_color]
-            })
-
-        self.stroop_current_trial = 0
-        self.stroop_correct = 0
-
-    def get_current_stroop_trial(self):
-        """Get current Stroop trial data."""
-        if self.stroop_current_trial < len(self.stroop_trials):
-            return self.stroop_trials[self.stroop_current_trial]
-        return None
-
-    def start_stroop_timer(self, duration=30):
-        """Start Stroop test timer."""
-        screen = self.root.get_screen('strooptest')
-        screen.timer = str(duration)
-
-        def update_timer(dt):
-            current = int(screen.timer)
-            if current > 0:
-                screen.timer = str(current - 1)
-            else:
-                self.stroop_timer_event.cancel()
-                self.finish_stroop()
-                self.root.current = 'stroopscore'
-
-        self.stroop_timer_event = Clock.schedule_interval(update_timer, 1)
-
-    def cancel_stroop_timer(self):
-        """Cancel Stroop timer."""
-        if self.stroop_timer_event:
-            self.stroop_timer_event.cancel()
-            self.stroop_timer_event = None
-
-    def check_stroop_answer(self, user_answer):
-        """Check Stroop test answer and advance to next trial."""
-        trial = self.get_current_stroop_trial()
-        if trial:
-            correct_color = trial['ink_color'].lower()
-            if user_answer.strip().lower() == correct_color:
-                self.stroop_correct += 1
-
-        self.stroop_current_trial += 1
-
-        # Update display for next trial
-        screen = self.root.get_screen('strooptest')
-        next_trial = self.get_current_stroop_trial()
-
-        if next_trial:
-            screen.word_text = next_trial['word']
-            screen.word_color = next_trial['color_rgba']
-            screen.trial_number = self.stroop_current_trial + 1
-            return True  # More trials
-        else:
-            # All trials complete
-            self.cancel_stroop_timer()
-            return False
-
-    def finish_stroop(self):
-        """Calculate and display Stroop score."""
-        # Score based on correct answers out of 10 trials
-        # 9-10 correct = 5 points
-        # 7-8 correct = 4 points
-        # 5-6 correct = 3 points
-        # 3-4 correct = 2 points
-        # 1-2 correct = 1 point
-        # 0 correct = 0 points
-
-        if self.stroop_correct >= 9:
-            self.stroop_score = 5
-        elif self.stroop_correct >= 7:
-            self.stroop_score = 4
-        elif self.stroop_correct >= 5:
-            self.stroop_score = 3
-        elif self.stroop_correct >= 3:
-            self.stroop_score = 2
-        elif self.stroop_correct >= 1:
-            self.stroop_score = 1
+    def load_test(self, index):
+        """Load the plugin and screens of the test at index in the battery."""
+        if not 0 <= index < len(self.battery):
+            return None
+        plugin = get_plugin(self.battery[index])
+        load_screens(plugin, self.root, self.test(plugin.name))
+        if self.idle_renderer is not None:
+            self.idle_renderer.add_timed_screens(plugin.timed_screens)
+        return plugin
+
+    def start_battery(self):
+        """Begin the first test in the battery."""
+        # Start the session clock and event log from the participant's first test,
+        # not from when the title screen was shown
+        self.session_started_at = datetime.now().isoformat(timespec='seconds')
+        self.event_log = EventLog()
+        self.event_log.start(self.session_id, {'battery': list(self.battery)})
+
+        self.battery_index = -1
+        self.next_test()
+
+    def next_test(self):
+        """Advance to the next test in the battery, or to the final results."""
+        self.battery_index += 1
+        if self.battery_index >= len(self.battery):
+            self.calculate_final_results()
+            self.root.current = 'results'
+            return
+
+        plugin = self.load_test(self.battery_index)
+        self.begin_test(plugin.name)
+        self.phase_label = f"PHASE {self.battery_index + 1} OF {len(self.battery)}"
+        if self.battery_index + 1 < len(self.battery):
+            upcoming = get_plugin(self.battery[self.battery_index + 1])
+            self.next_step_label = f"Continue to {upcoming.title}"
         else:
-            self.stroop_score = 0
-
-        screen = self.root.get_screen('stroopscore')
-        screen.stroop_score = f"{self.stroop_score}/5"
-
-    # ========================================================================
-    # DELAYED WORD RECALL
-    # ========================================================================
-
-    def calculate_delayed_recall(self, input_words):
-        """Calculate score for delayed word recall."""
-        words_list = input_words.lower().replace(',', ' ').split()
-
-        for word in words_list:
-            word = word.strip()
-            if word in [w.lower() for w in self.words] and word not in self.checked_words_delayed:
-                self.delayed_recall_score += 1
-                self.checked_words_delayed.append(word)
-
-        return f"{self.delayed_recall_score}/5"
-
-    def finish_delayed_recall(self):
-        """Display delayed recall score."""
-        screen = self.root.get_screen('delayedrecallscore')
-        screen.delayed_score = f"{self.delayed_recall_score}/5"
+            self.next_step_label = "View Final Results"
+        # Load the following test once this test's first screen has finished
+        # transitioning in, so building its screens cannot stall the transition
+        screen = self.root.get_screen(plugin.first_screen)
+        screen.unbind(on_enter=self.preload_next_test)
+        screen.bind(on_enter=self.preload_next_test)
+        self.root.current = plugin.first_screen
+
+    def preload_next_test(self, screen):
+        """Load the test after the current one while the current one runs."""
+        screen.unbind(on_enter=self.preload_next_test)
+        self.load_test(self.battery_index + 1)
+
+    def begin_test(self, name):
+        """Draw a test's data for this session, log it and prepare the test."""
+        test = self.test(name)
+        test.generate_stimuli()
+        if self.event_log is not None:
+            self.event_log.start_test(name, test.stimuli)
+        test.prepare()
+        return test
 
     # ========================================================================
     # FINAL RESULTS
     # ========================================================================
 
+    @logged
     def calculate_final_results(self):
         """Calculate and display final assessment results."""
-        # Calculate total raw score (out of 32)
-        raw_total = (
-            self.orientation_score +           # 0-5
-            self.immediate_recall_score +      # 0-5
-            self.serial7s_score +              # 0-5
-            min(self.digit_span_forward_score + self.digit_span_backward_score, 4) +  # 0-4
-            self.fluency_score +               # 0-3
-            self.stroop_score +                # 0-5
-            self.delayed_recall_score          # 0-5
-        )
+        # Calculate total raw score over the tests in the battery (32 by default)
+        domain_scores = self.get_domain_scores()
+        raw_total = sum(score for _, score, _ in domain_scores)
+        max_total = sum(max_points for _, _, max_points in domain_scores)
 
         # Normalize to 30-point scale (similar to MoCA)
-        normalized_score = round((raw_total / 32) * 30)
+        normalized_score = round((raw_total / max_total) * 30) if max_total else 0
 
         # Determine category and interpretation
         if normalized_score >= 26:
@@ -809,53 +397,146 @@ class DementiaDiagnosisApp(App):
         screen.total_score = f"{normalized_score}/30"
         screen.score_category = category
         screen.interpretation = interpretation
+        screen.score_breakdown = self.get_score_breakdown()
+
+        screen.report_status = ""
 
-        # Store for reference
+        # Store for reference; records and history share this completion time
+        self.session_completed_at = datetime.now().isoformat(timespec='seconds')
         self.final_score = normalized_score
         self.final_category = category
+        self.final_interpretation = interpretation
+
+        self.save_event_log()
+        self.session_record = self.get_session_record()
+        self.save_session_record()
+        self.update_participant_history()
+
+    def get_domain_scores(self):
+        """Get (name, score, max points) for each test in the battery."""
+        plugins = [get_plugin(name) for name in self.battery]
+        return [
+            (plugin.title, self.test(plugin.name).score(), plugin.max_points) for plugin in plugins
+        ]
+
+    def get_final_scores(self):
+        """Get every test's raw score and the final score by field name."""
+        scores = {}
+        for name in self.battery:
+            scores.update(self.test(name).raw_scores())
+        scores['final_score'] = self.final_score
+        return scores
 
     def get_score_breakdown(self):
         """Get detailed score breakdown string."""
-        return (
-            f"Orientation: {self.orientation_score}/5\n"
-            f"Immediate Recall: {self.immediate_recall_score}/5\n"
-            f"Serial 7s: {self.serial7s_score}/5\n"
-            f"Digit Span: {min(self.digit_span_forward_score + self.digit_span_backward_score, 4)}/4\n"
-            f"Category Fluency: {self.fluency_score}/3\n"
-            f"Stroop Test: {self.stroop_score}/5\n"
-            f"Delayed Recall: {self.delayed_recall_score}/5"
+        return "\n".join(
+            f"{name}: {score}/{max_points}" for name, score, max_points in self.get_domain_scores()
+        )
+
+    # ========================================================================
+    # EVENT LOG
+    # ========================================================================
+
+    def save_event_log(self):
+        """Record the final scores and write the session's event log."""
+        if self.event_log is None:
+            return
+        self.event_log.finish(self.get_final_scores())
+
+        log_dir = os.path.join(self.user_data_dir, "eventlogs")
+        os.makedirs(log_dir, exist_ok=True)
+        self.event_log.save(os.path.join(log_dir, f"{self.session_id}.jsonl"))
+
+    # ========================================================================
+    # LONGITUDINAL HISTORY
+    # ========================================================================
+
+    def update_participant_history(self):
+        """Add this session to the participant's history and show the change."""
+        screen = self.root.get_screen('results')
+        screen.change_summary = ""
+        if self.history is None or not self.participant_id.strip():
+            return
+
+        changes = self.history.add_session(self.session_record)
+        summary = format_changes(changes)
+        if summary:
+            screen.change_summary = "[b]Change Since Previous Sessions[/b]\n" + summary
+
+    # ========================================================================
+    # SESSION RECORDS AND REPORTS
+    # ========================================================================
+
+    def get_session_record(self):
+        """Collect the completed session's results into a plain dictionary."""
+        stroop = self.tests.get('stroop')
+        return {
+            'session_id': self.session_id,
+            'participant_key': (
+                HistoryIndex.participant_key(self.participant_id.strip())
+                if self.participant_id.strip() else ""
+            ),
+            'started_at': self.session_started_at,
+            'completed_at': self.session_completed_at,
+            'domains': [
+                {'name': name, 'score': int(score), 'max': max_points}
+                for name, score, max_points in self.get_domain_scores()
+            ],
+            'total_score': self.final_score,
+            'category': self.final_category,
+            'interpretation': self.final_interpretation,
+            'stimuli': self.get_stimuli(),
+            'events': self.event_log.events if self.event_log else [],
+            'scores': self.get_final_scores(),
+            'timings': {
+                'stroop_reaction_ms': list(stroop.reaction_times) if stroop else [],
+                'latency_correction_ms': (
+                    round(self.latency_profile.correction_ms, 1) if self.latency_profile else 0.0
+                ),
+            },
+        }
+
+    def save_session_record(self):
+        """Write the completed session's record to the sessions directory."""
+        # Headless replays and soak tests have no event log and save nothing
+        if self.event_log is None:
+            return
+        record = self.session_record
+        sessions_dir = os.path.join(self.user_data_dir, "sessions")
+        try:
+            os.makedirs(sessions_dir, exist_ok=True)
+            save_record(record, os.path.join(sessions_dir, record['session_id'] + RECORD_EXTENSION))
+        except (OSError, OverflowError, ValueError) as error:
+            self.root.get_screen('results').report_status = f"Could not save session record: {error}"
+
+    def save_report(self):
+        """Render the completed session's report in the background."""
+        screen = self.root.get_screen('results')
+        screen.report_status = "Generating report..."
+        future = self.report_generator.submit(
+            self.session_record, os.path.join(self.user_data_dir, "reports")
         )
+        future.add_done_callback(self.on_report_done)
+
+    @mainthread
+    def on_report_done(self, future):
+        """Show where the report was saved once the worker finishes."""
+        screen = self.root.get_screen('results')
+        try:
+            screen.report_status = f"Report saved to {future.result()}"
+        except Exception as error:
+            screen.report_status = f"Report failed: {error}"
 
     def restart_assessment(self):
         """Reset all scores and restart the assessment."""
-        # Reset all scores
-        self.orientation_score = 0
-        self.immediate_recall_score = 0
-        self.serial7s_score = 0
-        self.digit_span_forward_score = 0
-        self.digit_span_backward_score = 0
-        self.fluency_score = 0
-        self.stroop_score = 0
-        self.delayed_recall_score = 0
-
-        # Reset state variables
-        self.checked_words_immediate = []
-        self.checked_words_delayed = []
-        self.checked_numbers = []
-        self.current_orientation_index = 0
-        self.animals_entered = []
-        self.stroop_current_trial = 0
-        self.stroop_correct = 0
-
-        # Reset display properties
-        self.recent_animals_text = "None yet"
-        self.animals_count_text = "0"
-
-        # Reinitialize tests with new data
-        self.initialize_tests()
+        # Cancel pending timers and empty per-session buffers
+        self.lifecycle.release()
 
-        # Update word display
-        self.on_start()
+        self.session_record = None
+        self.participant_id = ""
+
+        # Reset every test's scores and state for a new session
+        self.initialize_tests()
 
         # Go back to title screen
         self.root.current = 'title'
@@ -0,0 +1,160 @@
+"""
+CogniScan - Idle-Aware Rendering
+
+Kivy only redraws when something on the canvas changes, but its main loop
+still wakes at the full frame rate to poll for input and run Clock events.
+On battery-powered kiosks that idle between participants, most of that work
+is wasted: the intro, score and description screens are static.
+
+IdleRenderer lowers the main loop rate on static screens and raises it to
+the full rate when:
+
+- a timed screen is shown (word display, category fluency, Stroop), for as
+  long as it is current
+- the user touches the screen or presses a key, for a short window so
+  button feedback and screen transitions stay smooth
+
+CpuMeter is a measurement harness that logs the process CPU time spent per
+minute, separately for minutes spent entirely idle and other minutes, and
+reports the averages when the app stops.
+"""
+
+import time
+
+from kivy.clock import Clock
+from kivy.config import Config
+from kivy.logger import Logger
+
+
+IDLE_FPS = 10
+
+# Seconds to stay at the full rate after input or a screen change
+WAKE_SECONDS = 2.0
+
+
+def configured_max_fps():
+    """The device's configured frame rate cap (graphics.maxfps; 0 is uncapped)."""
+    return Config.getint('graphics', 'maxfps')
+
+
+def set_max_fps(fps):
+    """Change the main loop's frame rate cap at runtime."""
+    # ClockBase reads graphics.maxfps once at startup; _max_fps is what idle() uses
+    Clock._max_fps = float(fps)
+
+
+class IdleRenderer:
+    """
+    Switches the main loop between idle and full frame rate.
+
+    The full rate defaults to the device's configured graphics.maxfps, read
+    when the renderer is created, so waking restores the rate the app started
+    with. A configured cap below idle_fps is never raised while idle.
+    """
+
+    def __init__(self, manager, idle_fps=IDLE_FPS, active_fps=None, wake_seconds=WAKE_SECONDS):
+        self.manager = manager
+        self.active_fps = configured_max_fps() if active_fps is None else active_fps
+        self.idle_fps = min(idle_fps, self.active_fps) if self.active_fps > 0 else idle_fps
+        self.timed_screens = set()
+        self.idle = False
+        self._sleep_trigger = Clock.create_trigger(self._on_wake_elapsed, wake_seconds)
+
+    def attach(self):
+        """Start following screen changes and user input."""
+        # Imported here so headless users of main.py never open a window
+        from kivy.core.window import Window
+
+        self.manager.bind(current=self._on_screen_change)
+        Window.bind(on_touch_down=self._on_input, on_key_down=self._on_input)
+        self.wake()
+
+    def add_timed_screens(self, names):
+        """Mark screens that need the full frame rate while current."""
+        self.timed_screens.update(names)
+        if self.manager.current in self.timed_screens:
+            self.wake()
+
+    def wake(self):
+        """Run at the full rate, then fall back to idle unless a timed screen is current."""
+        if self.idle:
+            self.idle = False
+            set_max_fps(self.active_fps)
+        self._sleep_trigger.cancel()
+        self._sleep_trigger()
+
+    def _on_screen_change(self, manager, current):
+        self.wake()
+
+    def _on_input(self, *args):
+        self.wake()
+
+    def _on_wake_elapsed(self, dt):
+        if self.manager.current in self.timed_screens:
+            # Keep checking; the timed screen decides how long we stay awake
+            self._sleep_trigger()
+            return
+        self.idle = True
+        set_max_fps(self.idle_fps)
+
+
+class CpuMeter:
+    """
+    Logs process CPU time per minute, split into idle and active minutes.
+
+    renderer is the app's IdleRenderer, or None when idle rendering is off;
+    every minute then counts as active, which gives the baseline to compare
+    against.
+    """
+
+    def __init__(self, renderer=None, interval=60):
+        self.renderer = renderer
+        self.interval = interval
+        self.idle_minutes = []
+        self.active_minutes = []
+        self._event = None
+
+    def start(self):
+        self._last_cpu = time.process_time()
+        self._idle_throughout = self._renderer_idle()
+        if self.renderer is not None:
+            self.renderer.manager.bind(current=self._on_screen_change)
+        self._poll = Clock.schedule_interval(self._check_idle, 0.5)
+        self._event = Clock.schedule_interval(self._sample, self.interval)
+
+    def stop(self):
+        """Stop sampling and log the averages."""
+        if self._event is not None:
+            self._event.cancel()
+            self._poll.cancel()
+            self._event = None
+        for label, samples in (("idle", self.idle_minutes), ("active", self.active_minutes)):
+            if samples:
+                Logger.info(
+                    "CpuMeter: %.3f s CPU per %s minute (mean of %d)",
+                    sum(samples) / len(samples), label, len(samples),
+                )
+
+    def _on_screen_change(self, *args):
+        self._idle_throughout = False
+
+    def _renderer_idle(self):
+        return self.renderer is not None and self.renderer.idle
+
+    def _check_idle(self, dt):
+        if not self._renderer_idle():
+            self._idle_throughout = False
+
+    def _sample(self, dt):
+        now = time.process_time()
+        # Normalize to a full minute in case the interval was overrun
+        per_minute = (now - self._last_cpu) * 60 / max(dt, 1e-6)
+        self._last_cpu = now
+        if self._idle_throughout:
+            self.idle_minutes.append(per_minute)
+            label = "idle"
+        else:
+            self.active_minutes.append(per_minute)
+            label = "active"
+        Logger.info("CpuMeter: %.3f s CPU over last %s minute", per_minute, label)
+        self._idle_throughout = self._renderer_idle()
@@ -0,0 +1,190 @@
+"""
+CogniScan - Event Log Replay
+
+Feeds a recorded event log (see eventlog.py) back through the application's
+handlers without a window, in virtual time, and checks that the replayed
+scores match the scores recorded at the end of the session. Used to
+investigate disputed scores and to check that handler changes do not alter
+the scoring of past sessions.
+
+    python replay.py LOG [LOG ...] [--speed 1000] [--workers 4]
+
+With no --speed, events are replayed as fast as possible. Large archives are
+replayed in parallel across worker processes.
+"""
+
+import argparse
+import glob
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+if __name__ == '__main__':
+    # Keep Kivy from parsing the replay command-line options
+    os.environ.setdefault('KIVY_NO_ARGS', '1')
+
+from battery import AVAILABLE_TESTS
+from eventlog import EventLog, TEST_START
+from lifecycle import SessionLifecycle
+
+
+# ============================================================================
+# HEADLESS APP
+# ============================================================================
+
+class HeadlessScreen:
+    """Attribute holder standing in for a Screen widget."""
+
+    def __init__(self):
+        self.ids = {}
+
+
+class HeadlessRoot:
+    """Stand-in for the ScreenManager: tracks the current screen name only."""
+
+    def __init__(self):
+        self.current = 'title'
+        self._screens = {}
+
+    def get_screen(self, name):
+        if name not in self._screens:
+            self._screens[name] = HeadlessScreen()
+        return self._screens[name]
+
+
+def headless_app(log=None):
+    """
+    Create an app instance with no window, running the log's battery if a
+    log is given. Test data is loaded as the log's tests start.
+    """
+    from main import DementiaDiagnosisApp
+
+    app = DementiaDiagnosisApp()
+    app.root = HeadlessRoot()
+    app.lifecycle = SessionLifecycle()
+    app.initialize_tests()
+    if log is not None:
+        app.session_id = log.header['session_id']
+        app.battery[:] = log.header['stimuli']['battery']
+    return app
+
+
+def logged_handler(app, event):
+    """
+    Get the logged method an event names: "<test>.<method>" on a test's
+    controller, or a bare method name on the app.
+    """
+    test, _, name = event.rpartition('.')
+    if test and test not in AVAILABLE_TESTS:
+        return None
+    target = app.test(test) if test else app
+    handler = getattr(target, name, None)
+    return handler if getattr(handler, 'logged', False) else None
+
+
+# ============================================================================
+# REPLAY
+# ============================================================================
+
+class VirtualClock:
+    """
+    Session time during a replay.
+
+    Time jumps straight to each event's timestamp; with a speed factor the
+    replay also sleeps for the gap divided by that factor.
+    """
+
+    def __init__(self, speed=None):
+        self.speed = speed
+        self.now = 0.0
+
+    def advance_to(self, t):
+        if self.speed and t > self.now:
+            time.sleep((t - self.now) / self.speed)
+        self.now = max(self.now, t)
+
+
+class ReplayResult:
+    """Outcome of replaying one event log."""
+
+    def __init__(self, path, expected, actual, virtual_seconds, wall_seconds):
+        self.path = path
+        self.expected = expected
+        self.actual = actual
+        self.virtual_seconds = virtual_seconds
+        self.wall_seconds = wall_seconds
+
+    @property
+    def matched(self):
+        return self.expected is not None and self.expected == self.actual
+
+    @property
+    def mismatches(self):
+        """Names of scores that differ between the log and the replay."""
+        if self.expected is None:
+            return []
+        return sorted(name for name in self.expected if self.expected[name] != self.actual.get(name))
+
+    @property
+    def speedup(self):
+        return self.virtual_seconds / self.wall_seconds if self.wall_seconds else float('inf')
+
+    def __repr__(self):
+        status = "match" if self.matched else "MISMATCH %s" % ", ".join(self.mismatches)
+        return "%s: %s (%.0fx)" % (self.path, status, self.speedup)
+
+
+def replay_log(path, speed=None):
+    """Replay one event log file and compare its scores."""
+    log = EventLog.load(path)
+    app = headless_app(log)
+    clock = VirtualClock(speed)
+
+    wall_start = time.perf_counter()
+    for entry in log.entries:
+        if entry['event'] == TEST_START:
+            app.test(entry['test']).restore_stimuli(entry['stimuli'])
+            continue
+        if 'args' not in entry:
+            continue
+        handler = logged_handler(app, entry['event'])
+        if handler is None:
+            raise ValueError("%s: cannot replay event %r" % (path, entry['event']))
+        clock.advance_to(entry['t'])
+        handler(*entry['args'])
+    wall_seconds = time.perf_counter() - wall_start
+    app.lifecycle.release()
+
+    actual = app.get_final_scores()
+    return ReplayResult(path, log.expected_scores, actual, clock.now, wall_seconds)
+
+
+def replay_archive(paths, speed=None, workers=None):
+    """Replay many event logs in parallel. Returns results in input order."""
+    paths = list(paths)
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        return list(executor.map(replay_log, paths, [speed] * len(paths)))
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Replay CogniScan session event logs.")
+    parser.add_argument('logs', nargs='+', help="event log files or directories of them")
+    parser.add_argument('--speed', type=float, default=None,
+                        help="replay speed factor, e.g. 1000 (default: as fast as possible)")
+    parser.add_argument('--workers', type=int, default=None)
+    args = parser.parse_args()
+
+    paths = []
+    for target in args.logs:
+        if os.path.isdir(target):
+            paths.extend(sorted(glob.glob(os.path.join(target, "*.jsonl"))))
+        else:
+            paths.append(target)
+
+    results = replay_archive(paths, args.speed, args.workers)
+    for result in results:
+        print(result)
+    failed = sum(1 for result in results if not result.matched)
+    print("%d replayed, %d mismatched" % (len(results), failed))
+    sys.exit(1 if failed else 0)
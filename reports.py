@@ -0,0 +1,205 @@
+"""
+CogniScan - Printable Result Reports
+
+Renders a session record (see DementiaDiagnosisApp.get_session_record) into a
+self-contained HTML report with per-domain bar charts. Reports contain no
+external resources, so they can be opened offline and printed or saved as PDF
+from any browser.
+
+Rendering runs in a worker process pool so the UI thread is never blocked.
+Reports for a whole day's sessions can also be rendered in parallel from the
+command line:
+
+    python reports.py SESSIONS_DIR OUTPUT_DIR --date 2026-10-19
+"""
+
+import argparse
+import glob
+import html
+import os
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date
+from functools import lru_cache
+
+from session_codec import META, RECORD_EXTENSION, RESULT_SECTIONS, load_record
+
+
+# ============================================================================
+# HTML RENDERING
+# ============================================================================
+
+CHART_WIDTH = 320
+CHART_HEIGHT = 28
+
+PAGE_TEMPLATE = """<!DOCTYPE html>
+<html lang="en">
+<head>
+<meta charset="utf-8">
+<title>CogniScan Report - {session_id}</title>
+<style>
+body {{ font-family: Helvetica, Arial, sans-serif; color: #2C3E50; margin: 2em; }}
+h1 {{ margin-bottom: 0; }}
+.meta {{ color: #7F8C8D; margin-top: 0.2em; }}
+.score {{ font-size: 3em; color: #27AE60; font-weight: bold; margin: 0.3em 0 0 0; }}
+.category {{ font-size: 1.4em; color: #3498DB; font-weight: bold; }}
+table {{ border-collapse: collapse; margin: 1em 0; }}
+td {{ padding: 0.3em 0.8em 0.3em 0; vertical-align: middle; }}
+.disclaimer {{ border: 2px solid #E74C3C; padding: 0.8em; margin-top: 2em; }}
+@media print {{ body {{ margin: 0; }} }}
+</style>
+</head>
+<body>
+<h1>CogniScan Assessment Report</h1>
+<p class="meta">Session {session_id} &middot; Completed {completed_at}</p>
+<p class="score">{total_score}/30</p>
+<p class="category">{category}</p>
+<h2>Score Breakdown</h2>
+<table>
+{rows}
+</table>
+<h2>Interpretation</h2>
+<p>{interpretation}</p>
+<div class="disclaimer">
+<strong>IMPORTANT:</strong> This screening tool is for educational purposes only
+and is NOT a medical diagnosis. Results should be discussed with a qualified
+healthcare professional.
+</div>
+</body>
+</html>
+"""
+
+ROW_TEMPLATE = "<tr><td>{name}</td><td>{score}/{max}</td><td>{chart}</td></tr>"
+
+
+@lru_cache(maxsize=None)
+def chart_template(max_points):
+    """
+    Return the SVG bar chart template for a domain scored out of max_points.
+
+    The frame and tick marks depend only on the maximum, so they are built
+    once per maximum and only the bar width is filled in per report.
+    """
+    step = CHART_WIDTH / max_points
+    ticks = "".join(
+        '<line x1="{0:.1f}" y1="0" x2="{0:.1f}" y2="{1}" stroke="#FFFFFF" stroke-width="2"/>'
+        .format(step * i, CHART_HEIGHT)
+        for i in range(1, max_points)
+    )
+    return (
+        '<svg xmlns="http://www.w3.org/2000/svg" width="{w}" height="{h}">'
+        '<rect width="{w}" height="{h}" fill="#ECF0F1"/>'
+        '<rect width="{{bar:.1f}}" height="{h}" fill="#27AE60"/>'
+        '{ticks}</svg>'
+    ).format(w=CHART_WIDTH, h=CHART_HEIGHT, ticks=ticks)
+
+
+def render_chart(score, max_points):
+    """Render the bar chart for one domain score."""
+    fraction = min(max(score / max_points, 0), 1) if max_points else 0
+    return chart_template(max_points).format(bar=fraction * CHART_WIDTH)
+
+
+def render_html(record):
+    """Render a session record as a self-contained HTML document."""
+    rows = "\n".join(
+        ROW_TEMPLATE.format(
+            name=html.escape(domain['name']),
+            score=domain['score'],
+            max=domain['max'],
+            chart=render_chart(domain['score'], domain['max']),
+        )
+        for domain in record['domains']
+    )
+    return PAGE_TEMPLATE.format(
+        session_id=html.escape(record['session_id']),
+        completed_at=html.escape(record['completed_at']),
+        total_score=record['total_score'],
+        category=html.escape(record['category']),
+        interpretation=html.escape(record['interpretation']),
+        rows=rows,
+    )
+
+
+def write_report(record, output_dir):
+    """Render a session record and write it to output_dir. Returns the path."""
+    os.makedirs(output_dir, exist_ok=True)
+    path = os.path.join(output_dir, "cogniscan-%s.html" % record['session_id'])
+    with open(path, "w", encoding="utf-8") as file:
+        file.write(render_html(record))
+    return path
+
+
+def _write_report_file(record_path, output_dir):
+    """Worker entry point for batch rendering from a session record file."""
+    return write_report(load_record(record_path, RESULT_SECTIONS), output_dir)
+
+
+# ============================================================================
+# BACKGROUND GENERATION
+# ============================================================================
+
+class ReportGenerator:
+    """
+    Renders reports in a pool of worker processes.
+
+    The pool is created on first use so the app does not pay for it unless
+    a report is requested.
+    """
+
+    def __init__(self, max_workers=None):
+        self.max_workers = max_workers
+        self._executor = None
+
+    @property
+    def executor(self):
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=self.max_workers)
+        return self._executor
+
+    def submit(self, record, output_dir):
+        """Render one report in the background. Returns a Future of its path."""
+        return self.executor.submit(write_report, record, output_dir)
+
+    def render_batch(self, record_paths, output_dir):
+        """Render reports for many session record files in parallel."""
+        record_paths = list(record_paths)
+        return list(self.executor.map(
+            _write_report_file, record_paths, [output_dir] * len(record_paths)
+        ))
+
+    def shutdown(self, wait=True):
+        """Stop the worker pool."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=wait)
+            self._executor = None
+
+
+def session_records_for_day(sessions_dir, day):
+    """Return the session record files in sessions_dir completed on day."""
+    paths = []
+    for path in sorted(glob.glob(os.path.join(sessions_dir, "*" + RECORD_EXTENSION))):
+        completed_at = load_record(path, {META}).get('completed_at', '')
+        if completed_at.startswith(day.isoformat()):
+            paths.append(path)
+    return paths
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Batch-render CogniScan session reports.")
+    parser.add_argument('sessions_dir')
+    parser.add_argument('output_dir')
+    parser.add_argument('--date', type=date.fromisoformat, default=date.today(),
+                        help="day to render, as YYYY-MM-DD (default: today)")
+    parser.add_argument('--workers', type=int, default=None)
+    args = parser.parse_args()
+
+    generator = ReportGenerator(args.workers)
+    try:
+        written = generator.render_batch(
+            session_records_for_day(args.sessions_dir, args.date), args.output_dir
+        )
+    finally:
+        generator.shutdown()
+    for path in written:
+        print(path)
+    print("%d report(s) written" % len(written))
@@ -0,0 +1,508 @@
+"""
+CogniScan - Binary Session Record Codec
+
+A compact, schema-versioned binary encoding of a full session record (see
+DementiaDiagnosisApp.get_session_record): words, digit sequences, Stroop
+trials, logged responses, scores and timings. Records move between kiosks,
+the results store and the upload queue in this format.
+
+Layout:
+
+    header   b"CSR" | format version (uint8) | schema version (uint16)
+    section  tag (uint16) | payload length (uint32) | payload
+    ...
+
+Every section payload has the same shape: a block of NUL-separated UTF-8
+strings, an array of int32 and an array of float64 (all little-endian):
+
+    payload  strings length (uint32) | int count (uint32) | float count (uint32)
+             | strings | ints | floats
+
+so a section decodes with a handful of bulk operations rather than one
+Python call per field.
+
+Schema evolution: decoders skip sections with unknown tags and ignore
+values appended after the ones they know at the end of a section's int and
+float arrays. New data therefore goes in new sections (or is appended to
+those arrays), and the schema version is bumped. Older decoders keep
+reading newer records. The format version only changes for incompatible
+layouts, and decoders reject formats they do not know.
+
+Run this module directly to round-trip check the codec and benchmark it
+against JSON:
+
+    python session_codec.py --bench
+"""
+
+import argparse
+import json
+import struct
+import sys
+import timeit
+from array import array
+
+
+MAGIC = b"CSR"
+FORMAT_VERSION = 1
+SCHEMA_VERSION = 1
+
+HEADER = struct.Struct("<3sBH")
+SECTION = struct.Struct("<HI")
+PAYLOAD = struct.Struct("<III")
+
+SEPARATOR = "\x00"
+
+# Section tags (never reuse a retired tag)
+META = 1
+DOMAINS = 2
+WORDS = 3
+DIGITS = 4
+STROOP = 5
+ORIENTATION = 6
+BATTERY = 7
+EVENTS = 8
+SCORES = 9
+TIMINGS = 10
+
+META_FIELDS = ('session_id', 'participant_key', 'started_at', 'completed_at', 'category', 'interpretation')
+
+# Sections needed to show or aggregate a session's results
+RESULT_SECTIONS = frozenset([META, DOMAINS, SCORES])
+
+# Stands in for a missing integer value such as an uncomputed final score
+NONE_INT = -2 ** 31
+
+
+# ============================================================================
+# SECTION PAYLOADS
+# ============================================================================
+
+def _pack(strings=(), ints=(), floats=()):
+    """Pack one section payload."""
+    for value in strings:
+        if SEPARATOR in value:
+            raise ValueError(f"Cannot encode string containing NUL: {value!r}")
+    text = SEPARATOR.join(strings).encode('utf-8')
+    int_array = array('i', ints)
+    float_array = array('d', floats)
+    if sys.byteorder == 'big':
+        int_array.byteswap()
+        float_array.byteswap()
+    # A leading marker byte keeps [] and [""] distinguishable
+    return b"".join((
+        PAYLOAD.pack(len(text) + (1 if strings else 0), len(int_array), len(float_array)),
+        b"\x01" + text if strings else b"",
+        int_array.tobytes(),
+        float_array.tobytes(),
+    ))
+
+
+def _unpack(payload):
+    """Unpack one section payload into (strings, ints, floats) lists."""
+    text_length, int_count, float_count = PAYLOAD.unpack_from(payload)
+    position = PAYLOAD.size
+    if text_length:
+        strings = str(payload[position + 1:position + text_length], 'utf-8').split(SEPARATOR)
+    else:
+        strings = []
+    position += text_length
+    return strings, _read_array('i', payload, position, int_count), \
+        _read_array('d', payload, position + 4 * int_count, float_count)
+
+
+def _read_array(typecode, payload, position, count):
+    """Read count little-endian values of an array typecode as a list."""
+    if not count:
+        return []
+    values = array(typecode)
+    values.frombytes(payload[position:position + values.itemsize * count])
+    if sys.byteorder == 'big':
+        values.byteswap()
+    return values.tolist()
+
+
+def _optional_int(value):
+    return NONE_INT if value is None else value
+
+
+def _from_optional_int(value):
+    return None if value == NONE_INT else value
+
+
+# ============================================================================
+# ENCODER
+# ============================================================================
+
+def encode(record):
+    """Encode a session record dictionary to bytes."""
+    sections = []
+
+    def add(tag, payload):
+        sections.append(SECTION.pack(tag, len(payload)))
+        sections.append(payload)
+
+    add(META, _pack(
+        [record.get(name) or "" for name in META_FIELDS],
+        [_optional_int(record.get('total_score'))],
+    ))
+
+    if 'domains' in record:
+        domains = record['domains']
+        ints = []
+        for domain in domains:
+            ints.extend((domain['score'], domain['max']))
+        add(DOMAINS, _pack([domain['name'] for domain in domains], ints))
+
+    # Each test contributes its own stimuli, so only the battery's tests are present
+    stimuli = record.get('stimuli') or {}
+    if 'words' in stimuli:
+        add(WORDS, _pack(stimuli['words']))
+    if 'forward_digits' in stimuli:
+        forward, backward = stimuli['forward_digits'], stimuli['backward_digits']
+        add(DIGITS, _pack(ints=[len(forward), len(backward)] + list(forward) + list(backward)))
+
+    if 'stroop_trials' in stimuli:
+        # Ink colors are indices into a palette of the colors the trials use
+        palette, rgba, ink_indices = [], [], []
+        for trial in stimuli['stroop_trials']:
+            if trial['ink_color'] not in palette:
+                palette.append(trial['ink_color'])
+                rgba.extend(trial['color_rgba'])
+            ink_indices.append(palette.index(trial['ink_color']))
+        words = [trial['word'] for trial in stimuli['stroop_trials']]
+        add(STROOP, _pack(palette + words, [len(palette)] + ink_indices, rgba))
+
+    if 'orientation_questions' in stimuli:
+        questions = stimuli['orientation_questions']
+        add(ORIENTATION, _pack(list(questions) + list(stimuli['orientation_answers']), [len(questions)]))
+    if 'battery' in stimuli:
+        add(BATTERY, _pack(stimuli['battery']))
+
+    if 'events' in record:
+        names, ints, args, times = [], [], [], []
+        for event in record['events']:
+            if event['event'] not in names:
+                names.append(event['event'])
+            ints.extend((names.index(event['event']), len(event['args'])))
+            args.extend(event['args'])
+            times.append(event['t'])
+        add(EVENTS, _pack(names + args, [len(names), len(record['events'])] + ints, times))
+
+    if 'scores' in record:
+        scores = record['scores']
+        add(SCORES, _pack(list(scores), [_optional_int(value) for value in scores.values()]))
+
+    if 'timings' in record:
+        timings = record['timings']
+        reactions = timings['stroop_reaction_ms']
+        add(TIMINGS, _pack(
+            ints=[len(reactions)],
+            floats=[timings['latency_correction_ms']] + list(reactions),
+        ))
+
+    return HEADER.pack(MAGIC, FORMAT_VERSION, SCHEMA_VERSION) + b"".join(sections)
+
+
+# ============================================================================
+# DECODER
+# ============================================================================
+
+def schema_version(data):
+    """Return the schema version a record was written with."""
+    magic, format_version, version = HEADER.unpack_from(data)
+    if magic != MAGIC:
+        raise ValueError("Not a CogniScan session record")
+    return version
+
+
+def decode(data, sections=None):
+    """
+    Decode bytes produced by encode() back into a session record.
+
+    sections optionally restricts decoding to a set of section tags (e.g.
+    {META, DOMAINS, SCORES} to read results without the event log); other
+    sections are skipped without being parsed.
+    """
+    magic, format_version, _ = HEADER.unpack_from(data)
+    if magic != MAGIC:
+        raise ValueError("Not a CogniScan session record")
+    if format_version != FORMAT_VERSION:
+        raise ValueError(f"Unsupported session record format {format_version}")
+
+    view = memoryview(data)
+    position = HEADER.size
+    end = len(data)
+    record = {}
+    stimuli = {}
+
+    while position < end:
+        tag, length = SECTION.unpack_from(view, position)
+        position += SECTION.size
+        payload = view[position:position + length]
+        position += length
+
+        if sections is not None and tag not in sections:
+            continue
+
+        if tag == META:
+            strings, ints, _ = _unpack(payload)
+            record.update(zip(META_FIELDS, strings))
+            record['total_score'] = _from_optional_int(ints[0])
+
+        elif tag == DOMAINS:
+            strings, ints, _ = _unpack(payload)
+            record['domains'] = [
+                {'name': name, 'score': ints[2 * i], 'max': ints[2 * i + 1]}
+                for i, name in enumerate(strings)
+            ]
+
+        elif tag == WORDS:
+            stimuli['words'] = _unpack(payload)[0]
+
+        elif tag == DIGITS:
+            _, ints, _ = _unpack(payload)
+            forward_end = 2 + ints[0]
+            stimuli['forward_digits'] = ints[2:forward_end]
+            stimuli['backward_digits'] = ints[forward_end:forward_end + ints[1]]
+
+        elif tag == STROOP:
+            strings, ints, floats = _unpack(payload)
+            palette_size = ints[0]
+            palette = strings[:palette_size]
+            words = strings[palette_size:]
+            stimuli['stroop_trials'] = [
+                {
+                    'word': word,
+                    'ink_color': palette[ink],
+                    'color_rgba': floats[4 * ink:4 * ink + 4],
+                }
+                for word, ink in zip(words, ints[1:1 + len(words)])
+            ]
+
+        elif tag == ORIENTATION:
+            strings, ints, _ = _unpack(payload)
+            stimuli['orientation_questions'] = strings[:ints[0]]
+            stimuli['orientation_answers'] = strings[ints[0]:]
+
+        elif tag == BATTERY:
+            stimuli['battery'] = _unpack(payload)[0]
+
+        elif tag == EVENTS:
+            strings, ints, floats = _unpack(payload)
+            name_count, event_count = ints[0], ints[1]
+            names = strings[:name_count]
+            args = strings[name_count:]
+            body = ints[2:2 + 2 * event_count]
+            events = []
+            arg_position = 0
+            for t, code, arg_count in zip(floats[:event_count], body[0::2], body[1::2]):
+                events.append({
+                    't': t,
+                    'event': names[code],
+                    'args': args[arg_position:arg_position + arg_count],
+                })
+                arg_position += arg_count
+            record['events'] = events
+
+        elif tag == SCORES:
+            strings, ints, _ = _unpack(payload)
+            record['scores'] = {
+                name: _from_optional_int(value) for name, value in zip(strings, ints)
+            }
+
+        elif tag == TIMINGS:
+            _, ints, floats = _unpack(payload)
+            record['timings'] = {
+                'stroop_reaction_ms': floats[1:1 + ints[0]],
+                'latency_correction_ms': floats[0],
+            }
+
+        # Unknown tags come from newer schemas and are skipped
+
+    if stimuli:
+        record['stimuli'] = stimuli
+    return record
+
+
+# ============================================================================
+# FILES
+# ============================================================================
+
+RECORD_EXTENSION = ".csr"
+
+
+def save_record(record, path):
+    """Write a session record in the binary format."""
+    with open(path, "wb") as file:
+        file.write(encode(record))
+
+
+def load_record(path, sections=None):
+    """Read a session record file; sections is passed to decode()."""
+    with open(path, "rb") as file:
+        return decode(file.read(), sections)
+
+
+# ============================================================================
+# ROUND-TRIP CHECKS AND BENCHMARK
+# ============================================================================
+
+def sample_record():
+    """A representative full session record."""
+    palette = {
+        'red': [1, 0.2, 0.2, 1],
+        'blue': [0.2, 0.4, 1, 1],
+        'green': [0.2, 0.8, 0.2, 1],
+        'yellow': [0.9, 0.9, 0.2, 1],
+    }
+    colors = list(palette)
+    trials = [
+        {'word': colors[i % 4].upper(), 'ink_color': colors[(i * 3 + 1) % 4],
+         'color_rgba': palette[colors[(i * 3 + 1) % 4]]}
+        for i in range(10)
+    ]
+    events = [{'t': 4.1234 + i, 'event': 'orientation.handle_submit', 'args': [answer]}
+              for i, answer in enumerate(["2026", "october", "monday", "19", "fall"])]
+    events += [{'t': 31.5, 'event': 'immediate_recall.on_display_timeout', 'args': []},
+               {'t': 45.25, 'event': 'immediate_recall.calculate_recall', 'args': ["rabbit lamp eyelash"]},
+               {'t': 70.0, 'event': 'serial7s.calculate', 'args': ["93, 86, 79, 72, 65"]},
+               {'t': 80.0, 'event': 'digit_span.handle_forward_submit', 'args': ["4 7 2"]},
+               {'t': 88.0, 'event': 'digit_span.handle_forward_submit', 'args': ["4 7 2 9"]},
+               {'t': 95.0, 'event': 'digit_span.handle_backward_submit', 'args': ["3 8"]},
+               {'t': 99.0, 'event': 'digit_span.handle_backward_submit', 'args': ["1 5 6"]}]
+    events += [{'t': 110.0 + i * 3.3, 'event': 'category_fluency.add_animal', 'args': [animal]}
+               for i, animal in enumerate("cat dog horse cow pig sheep goat lion tiger bear wolf fox".split())]
+    events += [{'t': 170.0, 'event': 'category_fluency.on_timeout', 'args': []}]
+    events += [{'t': 180.0 + i * 1.7, 'event': 'stroop.handle_button', 'args': [trial['ink_color']]}
+               for i, trial in enumerate(trials)]
+    events += [{'t': 240.0, 'event': 'delayed_recall.calculate_recall', 'args': ["rabbit eyelash"]},
+               {'t': 241.0, 'event': 'calculate_final_results', 'args': []}]
+    return {
+        'session_id': "20261019-101500-a1b2c3",
+        'participant_key': "5c2f0d9e1a7b4c36",
+        'started_at': "2026-10-19T10:15:00",
+        'completed_at': "2026-10-19T10:19:02",
+        'domains': [
+            {'name': "Orientation", 'score': 5, 'max': 5},
+            {'name': "Immediate Recall", 'score': 3, 'max': 5},
+            {'name': "Serial 7s", 'score': 5, 'max': 5},
+            {'name': "Digit Span", 'score': 3, 'max': 4},
+            {'name': "Category Fluency", 'score': 2, 'max': 3},
+            {'name': "Stroop Test", 'score': 5, 'max': 5},
+            {'name': "Delayed Recall", 'score': 2, 'max': 5},
+        ],
+        'total_score': 23,
+        'category': "Mild Cognitive Impairment",
+        'interpretation': "Your results suggest possible mild cognitive impairment (MCI). " * 5,
+        'timings': {
+            'stroop_reaction_ms': [812.4, 955.1, 701.9, 1203.0, 880.5, 760.2, 933.3, 1010.8, 690.0, 845.6],
+            'latency_correction_ms': 43.9,
+        },
+        'stimuli': {
+            'words': ["rabbit", "shadow", "lamp", "terrace", "eyelash"],
+            'orientation_questions': [
+                "What year is it?", "What month is it?", "What day of the week is it?",
+                "What is today's date (day number)?", "What season is it?",
+            ],
+            'orientation_answers': ["2026", "october", "monday", "19", "fall"],
+            'forward_digits': [4, 7, 2, 9, 1],
+            'backward_digits': [8, 3, 5, 1],
+            'stroop_trials': trials,
+            'battery': ["orientation", "immediate_recall", "serial7s", "digit_span",
+                        "category_fluency", "stroop", "delayed_recall"],
+        },
+        'events': events,
+        'scores': {
+            'orientation_score': 5, 'immediate_recall_score': 3, 'serial7s_score': 5,
+            'digit_span_forward_score': 2, 'digit_span_backward_score': 1,
+            'fluency_score': 2, 'stroop_score': 5, 'delayed_recall_score': 2,
+            'final_score': 23,
+        },
+    }
+
+
+def _check(condition, message):
+    # Explicit rather than assert, so the checks also run under python -O
+    if not condition:
+        raise AssertionError(message)
+
+
+def self_test():
+    """
+    Check round trips, including records from a newer schema. Raises
+    AssertionError naming the first failed check.
+    """
+    record = sample_record()
+    _check(decode(encode(record)) == record, "full record does not round-trip")
+
+    minimal = {'session_id': "s", 'participant_key': "", 'started_at': "", 'completed_at': "",
+               'category': "", 'interpretation': "", 'total_score': None}
+    _check(decode(encode(minimal)) == minimal, "minimal record does not round-trip")
+
+    partial = sample_record()
+    partial['stimuli'] = {'battery': ["orientation"], 'orientation_questions': ["Q?"],
+                          'orientation_answers': ["A"]}
+    _check(decode(encode(partial)) == partial, "custom battery stimuli do not round-trip")
+
+    edge = sample_record()
+    edge['stimuli']['words'] = [""]
+    edge['events'][0]['args'] = ["", "zoë 動物"]
+    edge['events'][-1]['t'] = 64 * 3600.0
+    _check(decode(encode(edge)) == edge, "empty/unicode strings or long event times do not round-trip")
+
+    # A newer writer adds an unknown section and extra trailing values
+    newer = bytearray(encode(record))
+    struct.pack_into("<H", newer, 4, SCHEMA_VERSION + 1)
+    extra = _pack(["future"], [1, 2, 3], [4.0])
+    newer += SECTION.pack(999, len(extra)) + extra
+    _check(decode(bytes(newer)) == record, "unknown sections are not skipped")
+    _check(schema_version(bytes(newer)) == SCHEMA_VERSION + 1, "schema version is not read")
+
+    results = decode(encode(record), RESULT_SECTIONS)
+    _check(results['domains'] == record['domains'] and 'events' not in results,
+           "results-only decode does not select sections")
+
+    return True
+
+
+def benchmark(number=2000, out=sys.stdout):
+    """Compare size and encode/decode time against JSON."""
+    record = sample_record()
+    binary = encode(record)
+    text = json.dumps(record).encode('utf-8')
+
+    results = {
+        'binary_encode': timeit.timeit(lambda: encode(record), number=number) / number,
+        'binary_decode': timeit.timeit(lambda: decode(binary), number=number) / number,
+        'json_encode': timeit.timeit(lambda: json.dumps(record).encode('utf-8'), number=number) / number,
+        'json_decode': timeit.timeit(lambda: json.loads(text), number=number) / number,
+        'binary_decode_results': timeit.timeit(
+            lambda: decode(binary, RESULT_SECTIONS), number=number
+        ) / number,
+    }
+    out.write("size:   binary %6d B   json %6d B   (%.0f%%)\n"
+              % (len(binary), len(text), 100 * len(binary) / len(text)))
+    out.write("encode: binary %6.1f us  json %6.1f us\n"
+              % (results['binary_encode'] * 1e6, results['json_encode'] * 1e6))
+    out.write("decode: binary %6.1f us  json %6.1f us\n"
+              % (results['binary_decode'] * 1e6, results['json_decode'] * 1e6))
+    out.write("decode results only: binary %6.1f us\n" % (results['binary_decode_results'] * 1e6))
+    results['binary_size'] = len(binary)
+    results['json_size'] = len(text)
+    return results
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="CogniScan session record codec.")
+    parser.add_argument('--bench', action='store_true', help="round-trip check and benchmark")
+    parser.add_argument('--number', type=int, default=2000)
+    parser.add_argument('--to-json', metavar='RECORD', help="print a .csr record as JSON")
+    args = parser.parse_args()
+
+    if args.to_json:
+        print(json.dumps(load_record(args.to_json), indent=2))
+    else:
+        self_test()
+        print("round-trip checks passed")
+        if args.bench:
+            benchmark(args.number)
@@ -0,0 +1,263 @@
+"""
+CogniScan - Word Similarity Matrix
+
+Precomputes pairwise similarity over the whole word bank so word sets for
+the recall tests can be drawn without rhyming, look-alike or same-category
+words (e.g. "apple, grape, lemon"), which make recall scores noisy.
+
+Similarity between two words is the largest of three measures, each in 0-1:
+
+- Orthographic: Dice coefficient over letter bigrams
+- Phonetic: matching Soundex codes, or a shared rhyming ending
+- Category: the words appear in the same category of the word bank
+
+Categories are labelled in words.txt: a "[name]" line starts a category and
+the words below it belong to it. A category may be continued further down
+the file under the same label, and a word may be listed under several. The
+matrix is quantized to one byte per pair, stored as the upper
+triangle of an array, and cached on disk keyed by the word bank's contents,
+so it is only recomputed when words.txt changes.
+"""
+
+import hashlib
+import os
+import random
+import struct
+from array import array
+
+
+CACHE_MAGIC = b"CSIM"
+CACHE_VERSION = 1
+CACHE_HEADER = struct.Struct("<4sB20sI")
+
+# Pairs scoring at or above this are never drawn into the same set
+DEFAULT_THRESHOLD = 0.5
+
+SOUNDEX_CODES = {
+    **dict.fromkeys("bfpv", "1"),
+    **dict.fromkeys("cgjkqsxz", "2"),
+    **dict.fromkeys("dt", "3"),
+    "l": "4",
+    **dict.fromkeys("mn", "5"),
+    "r": "6",
+}
+
+
+# ============================================================================
+# SIMILARITY MEASURES
+# ============================================================================
+
+def bigrams(word):
+    """Return the set of letter bigrams of a word, padded at both ends."""
+    padded = f"^{word}$"
+    return {padded[i:i + 2] for i in range(len(padded) - 1)}
+
+
+def orthographic_similarity(a, b):
+    """Dice coefficient over letter bigrams."""
+    grams_a, grams_b = bigrams(a), bigrams(b)
+    return 2 * len(grams_a & grams_b) / (len(grams_a) + len(grams_b))
+
+
+def soundex(word):
+    """Return the four-character Soundex code of a word."""
+    code = word[0].upper()
+    previous = SOUNDEX_CODES.get(word[0], "")
+    for letter in word[1:]:
+        digit = SOUNDEX_CODES.get(letter, "")
+        if digit and digit != previous:
+            code += digit
+        if letter not in "hw":
+            previous = digit
+    return (code + "000")[:4]
+
+
+def phonetic_similarity(a, b):
+    """1 for matching Soundex codes, otherwise scaled by shared rhyming ending."""
+    if soundex(a) == soundex(b):
+        return 1.0
+    suffix = 0
+    for letter_a, letter_b in zip(reversed(a), reversed(b)):
+        if letter_a != letter_b:
+            break
+        suffix += 1
+    return min(suffix, 3) / 3 if suffix >= 2 else 0.0
+
+
+def category_similarity(categories_a, categories_b):
+    """1 if the words share a category, otherwise 0."""
+    return 1.0 if categories_a & categories_b else 0.0
+
+
+# ============================================================================
+# WORD BANK
+# ============================================================================
+
+def read_word_bank(words_path):
+    """
+    Read words.txt into (words, categories).
+
+    Returns the unique words in file order and, for each word, the set of
+    category indices it belongs to (a word may be listed under several
+    categories). Raises ValueError for a word before the first label.
+    """
+    words, categories = [], {}
+    labels = {}
+    category = None
+    with open(words_path, "r") as file:
+        for line in file.read().splitlines():
+            word = line.strip().lower()
+            if not word:
+                continue
+            if word.startswith("[") and word.endswith("]"):
+                category = labels.setdefault(word[1:-1].strip(), len(labels))
+                continue
+            if category is None:
+                raise ValueError(f"{words_path}: word {word!r} is not under a [category] label")
+            if word not in categories:
+                words.append(word)
+                categories[word] = set()
+            categories[word].add(category)
+    return words, [categories[word] for word in words]
+
+
+def pair_index(i, j, n):
+    """Position of pair (i, j), i < j, in the flattened upper triangle."""
+    return i * (2 * n - i - 1) // 2 + (j - i - 1)
+
+
+class WordSimilarity:
+    """Quantized pairwise similarity matrix over a word bank."""
+
+    def __init__(self, words, matrix):
+        self.words = words
+        self.matrix = matrix
+        self.index = {word: i for i, word in enumerate(words)}
+        self._conflicts = {}
+
+    @classmethod
+    def build(cls, words, categories):
+        """Compute the matrix for a word bank."""
+        n = len(words)
+        matrix = array("B", bytes(n * (n - 1) // 2))
+        position = 0
+        for i in range(n):
+            for j in range(i + 1, n):
+                score = max(
+                    orthographic_similarity(words[i], words[j]),
+                    phonetic_similarity(words[i], words[j]),
+                    category_similarity(categories[i], categories[j]),
+                )
+                matrix[position] = round(score * 255)
+                position += 1
+        return cls(words, matrix)
+
+    @classmethod
+    def load(cls, words_path, cache_path=None):
+        """
+        Load the matrix for words_path, from cache_path when it is current.
+
+        The cache is rebuilt when missing, stale or unreadable. Failing to
+        write the cache is not an error; the matrix is simply rebuilt next
+        time.
+        """
+        with open(words_path, "rb") as file:
+            digest = hashlib.sha1(file.read()).digest()
+        words, categories = read_word_bank(words_path)
+        if cache_path is None:
+            cache_path = words_path + ".simcache"
+
+        try:
+            with open(cache_path, "rb") as file:
+                magic, version, cached_digest, n = CACHE_HEADER.unpack(
+                    file.read(CACHE_HEADER.size)
+                )
+                if (magic, version, cached_digest, n) == (CACHE_MAGIC, CACHE_VERSION, digest, len(words)):
+                    matrix = array("B")
+                    matrix.frombytes(file.read())
+                    if len(matrix) == n * (n - 1) // 2:
+                        return cls(words, matrix)
+        except (OSError, struct.error):
+            pass
+
+        similarity = cls.build(words, categories)
+        try:
+            temp_path = cache_path + ".tmp"
+            with open(temp_path, "wb") as file:
+                file.write(CACHE_HEADER.pack(CACHE_MAGIC, CACHE_VERSION, digest, len(words)))
+                file.write(similarity.matrix.tobytes())
+            os.replace(temp_path, cache_path)
+        except OSError:
+            pass
+        return similarity
+
+    def similarity(self, a, b):
+        """Similarity of two words in the bank, from 0 to 1."""
+        i, j = self.index[a.lower()], self.index[b.lower()]
+        if i == j:
+            return 1.0
+        if i > j:
+            i, j = j, i
+        return self.matrix[pair_index(i, j, len(self.words))] / 255
+
+    def conflict_masks(self, threshold=DEFAULT_THRESHOLD):
+        """
+        Return, for each word, a bitmask of words too similar to pair with it.
+
+        Masks are computed once per threshold; each word's mask includes
+        itself.
+        """
+        level = round(threshold * 255)
+        if level not in self._conflicts:
+            n = len(self.words)
+            masks = [1 << i for i in range(n)]
+            position = 0
+            matrix = self.matrix
+            for i in range(n):
+                for j in range(i + 1, n):
+                    if matrix[position] >= level:
+                        masks[i] |= 1 << j
+                        masks[j] |= 1 << i
+                    position += 1
+            self._conflicts[level] = masks
+        return self._conflicts[level]
+
+    def eligible_mask(self, predicate):
+        """Bitmask of words satisfying predicate."""
+        mask = 0
+        for i, word in enumerate(self.words):
+            if predicate(word):
+                mask |= 1 << i
+        return mask
+
+    def sample(self, k=5, threshold=DEFAULT_THRESHOLD, eligible=None, rng=random):
+        """
+        Draw k mutually dissimilar words.
+
+        Each pick is drawn from the words still allowed, and the picked
+        word's conflict mask is removed from the allowed set, so no set is
+        ever generated and then rejected. eligible is an optional bitmask
+        (see eligible_mask) restricting the candidates. Returns None if the
+        bank cannot supply k words under the threshold.
+        """
+        n = len(self.words)
+        masks = self.conflict_masks(threshold)
+        full = (1 << n) - 1 if eligible is None else eligible
+
+        for _ in range(10):
+            allowed = full
+            chosen = []
+            while len(chosen) < k and allowed:
+                # Random probes are almost always allowed; scan as a fallback
+                for _ in range(8):
+                    i = rng.randrange(n)
+                    if allowed >> i & 1:
+                        break
+                else:
+                    candidates = [i for i in range(n) if allowed >> i & 1]
+                    i = rng.choice(candidates)
+                chosen.append(i)
+                allowed &= ~masks[i]
+            if len(chosen) == k:
+                return [self.words[i] for i in chosen]
+        return None